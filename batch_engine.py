@@ -0,0 +1,147 @@
+"""Vectorized simulation of many independent snake games in lockstep.
+
+`BatchSimulation` mirrors the rules of `engine.Simulation` (wall hit, self
+hit, eat and grow) but keeps every board in NumPy arrays so one step() call
+advances all of them. Requires NumPy; the scalar engine does not.
+"""
+import numpy as np
+from constants import (
+    GRID_COLS,
+    GRID_ROWS,
+    INITIAL_SNAKE_LENGTH,
+    DIRECTIONS,
+)
+
+# Action codes accepted by step(): indices into ACTIONS, or KEEP for no turn.
+# Opposite directions differ only in the lowest bit (UP/DOWN, LEFT/RIGHT).
+ACTIONS = (DIRECTIONS['UP'], DIRECTIONS['DOWN'], DIRECTIONS['LEFT'], DIRECTIONS['RIGHT'])
+UP, DOWN, LEFT, RIGHT = range(4)
+KEEP = -1
+
+# Per-board event codes returned by step()
+NONE = 0
+EAT = 1
+WALL = 2
+SELF = 3
+
+_DX = np.array([d[0] for d in ACTIONS], dtype=np.int32)
+_DY = np.array([d[1] for d in ACTIONS], dtype=np.int32)
+
+
+class BatchSimulation:
+    """`n` snake games on `cols` x `rows` boards, stepped together.
+
+    State arrays (one row or entry per board):
+
+    * ``occ``    -- (n, cells) uint8 occupancy counts
+    * ``body``   -- (n, cells + 1) int32 ring buffers of cells, head at
+      ``start`` and ``length`` entries long
+    * ``heads``, ``dirs``, ``food`` (-1 when the board is full), ``score``,
+      ``ticks``, ``grow`` and ``over``
+    """
+
+    def __init__(self, n, cols=GRID_COLS, rows=GRID_ROWS, length=INITIAL_SNAKE_LENGTH, seed=None):
+        self.n = n
+        self.cols = cols
+        self.rows = rows
+        self.cells = cols * rows
+        self.capacity = self.cells + 1
+        self.initial_length = length
+        self.rng = np.random.default_rng(seed)
+
+        self.occ = np.zeros((n, self.cells), dtype=np.uint8)
+        self.body = np.zeros((n, self.capacity), dtype=np.int32)
+        self.start = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+        self.heads = np.zeros(n, dtype=np.int64)
+        self.dirs = np.full(n, RIGHT, dtype=np.int64)
+        self.food = np.full(n, -1, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.ticks = np.zeros(n, dtype=np.int64)
+        self.grow = np.zeros(n, dtype=bool)
+        self.over = np.zeros(n, dtype=bool)
+        self._rows = np.arange(n)
+        self.reset()
+
+    def reset(self, boards=None):
+        """Start fresh games on `boards` (indices or a boolean mask; all
+        boards when None)."""
+        if boards is None:
+            boards = self._rows
+        boards = self._rows[boards] if np.asarray(boards).dtype == bool else np.asarray(boards)
+        if not len(boards):
+            return
+        head = (self.rows // 2) * self.cols + self.cols // 2
+        initial = head - np.arange(self.initial_length)
+
+        self.occ[boards] = 0
+        self.occ[boards[:, None], initial[None, :]] = 1
+        self.body[boards, :self.initial_length] = initial
+        self.start[boards] = 0
+        self.length[boards] = self.initial_length
+        self.heads[boards] = head
+        self.dirs[boards] = RIGHT
+        self.score[boards] = 0
+        self.ticks[boards] = 0
+        self.grow[boards] = False
+        self.over[boards] = False
+        self._respawn(boards)
+
+    def _respawn(self, boards):
+        """Place food on a uniformly random free cell of each board."""
+        free = self.occ[boards] == 0
+        counts = free.sum(axis=1)
+        k = (self.rng.random(len(boards)) * counts).astype(np.int64)
+        pick = (free.cumsum(axis=1) > k[:, None]).argmax(axis=1)
+        self.food[boards] = np.where(counts > 0, pick, -1)
+
+    def step(self, actions=None):
+        """Advance every running board one tick.
+
+        `actions` is a length-`n` sequence of action codes (UP, DOWN, LEFT,
+        RIGHT or KEEP); reversals are ignored like Snake.change_direction.
+        Returns an int8 array of per-board event codes; finished boards do
+        not move and report NONE.
+        """
+        live = ~self.over
+        if actions is not None:
+            actions = np.asarray(actions, dtype=np.int64)
+            turn = live & (actions >= 0) & (actions != (self.dirs ^ 1))
+            self.dirs[turn] = actions[turn]
+
+        events = np.zeros(self.n, dtype=np.int8)
+        col = self.heads % self.cols + _DX[self.dirs]
+        row = self.heads // self.cols + _DY[self.dirs]
+        wall = live & ((col < 0) | (col >= self.cols) | (row < 0) | (row >= self.rows))
+        events[wall] = WALL
+        self.ticks[live] += 1
+
+        movers = np.flatnonzero(live & ~wall)
+        new_heads = row[movers] * self.cols + col[movers]
+
+        # push the new head into each ring buffer
+        start = (self.start[movers] - 1) % self.capacity
+        self.start[movers] = start
+        self.body[movers, start] = new_heads
+        self.length[movers] += 1
+        self.heads[movers] = new_heads
+        self.occ[movers, new_heads] += 1
+
+        # pop the tail unless the snake is growing this tick
+        popping = movers[~self.grow[movers]]
+        tail_pos = (self.start[popping] + self.length[popping] - 1) % self.capacity
+        self.occ[popping, self.body[popping, tail_pos]] -= 1
+        self.length[popping] -= 1
+        self.grow[movers] = False
+
+        hit_self = self.occ[movers, new_heads] > 1
+        events[movers[hit_self]] = SELF
+        self.over |= events >= WALL
+
+        ate = movers[~hit_self & (new_heads == self.food[movers])]
+        events[ate] = EAT
+        self.score[ate] += 1
+        self.grow[ate] = True
+        if len(ate):
+            self._respawn(ate)
+        return events
@@ -0,0 +1,522 @@
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+import fonts
+from objects import Snake, Food
+from engine import Simulation
+from constants import DIRECTIONS
+
+
+def _per_call_us(fn, iterations):
+    """Run `fn` `iterations` times and return the mean cost in microseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def bench_collision(lengths=(3, 10, 100, 1000, 10000), ticks=500):
+    """Per-tick cost of move() + check_self_collision() against snake length.
+
+    The board is sized so the snake can travel `ticks` cells to the right
+    without hitting a wall, so only the snake length varies between rows.
+    """
+    print("[bench] collision: per-tick move + self-collision check")
+    for length in lengths:
+        snake = Snake(length=length, cols=2 * (length + ticks) + 2, rows=3)
+
+        def tick():
+            snake.move()
+            snake.check_self_collision()
+
+        us = _per_call_us(tick, ticks)
+        print(f"[bench]   length={length:>6}  {us:8.2f} us/tick")
+
+
+def bench_respawn(fills=(0.0, 0.5, 0.9, 0.99), cols=100, rows=100, iterations=2000):
+    """Cost of Food.respawn() against how full the board is."""
+    print("[bench] respawn: food placement vs board fill")
+    for fill in fills:
+        snake = Snake(length=1, cols=cols, rows=rows)
+        grid = snake.grid
+        for index in range(int(cols * rows * fill)):
+            if grid.is_free(index):
+                grid.occupy(index)
+        food = Food(cols, rows)
+        us = _per_call_us(lambda: food.respawn(snake), iterations)
+        print(f"[bench]   fill={fill:5.0%}  {us:8.2f} us/respawn")
+
+
+class _PixelPoint:
+    """Stand-in for the old dict-backed, pixel-space Point segments."""
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def _traced_bytes(build):
+    """Return (object, bytes still allocated) for calling `build`."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        obj = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return obj, after - before
+
+
+def bench_memory(lengths=(1000, 10000, 100000)):
+    """Bytes per segment: packed cell store vs. a deque of pixel Points.
+
+    The board is sized to fit the snake on a single row, so the packed
+    numbers include the snake's full occupancy grid and free-cell index.
+    """
+    print("[bench] memory: bytes per segment (tracemalloc)")
+    for length in lengths:
+        _, legacy = _traced_bytes(
+            lambda: deque(_PixelPoint(5 + i * 20, 305) for i in range(length)))
+        _, packed = _traced_bytes(lambda: Snake(length=length, cols=2 * length, rows=1))
+        print(f"[bench]   length={length:>6}  legacy={legacy / length:7.1f} B  "
+              f"packed={packed / length:7.1f} B")
+
+
+def bench_engine(ticks=200000, cols=30, rows=30):
+    """Headless Simulation.step() throughput with a fixed square-loop policy."""
+    print("[bench] engine: headless ticks per second")
+    sim = Simulation(cols=cols, rows=rows, seed=1)
+    turns = [DIRECTIONS['UP'], DIRECTIONS['LEFT'], DIRECTIONS['DOWN'], DIRECTIONS['RIGHT']]
+    games = 0
+    start = time.perf_counter()
+    for i in range(ticks):
+        if sim.over:
+            sim.reset()
+            games += 1
+        sim.step(turns[(i // 7) % 4] if i % 7 == 0 else None)
+    elapsed = time.perf_counter() - start
+    print(f"[bench]   {ticks / elapsed:,.0f} ticks/s over {games} games")
+
+
+def bench_batch(boards=(1, 64, 1024, 4096), ticks=200, cols=30, rows=30):
+    """Board-ticks per second: BatchSimulation vs. a loop of Simulations."""
+    try:
+        import numpy as np
+        import batch_engine
+    except ImportError:
+        print("[bench] batch: skipped (NumPy not installed)")
+        return
+    print("[bench] batch: board-ticks per second (random actions, auto-reset)")
+    for n in boards:
+        rng = np.random.default_rng(0)
+        actions = rng.integers(-1, 4, size=(ticks, n))
+
+        batch = batch_engine.BatchSimulation(n, cols, rows, seed=0)
+        start = time.perf_counter()
+        for t in range(ticks):
+            batch.step(actions[t])
+            batch.reset(batch.over)
+        batched = n * ticks / (time.perf_counter() - start)
+
+        sims = [Simulation(cols, rows, rng=random.Random(i)) for i in range(n)]
+        directions = (None,) + batch_engine.ACTIONS
+        rows_of_actions = (actions + 1).tolist()
+        start = time.perf_counter()
+        for t in range(ticks):
+            row = rows_of_actions[t]
+            for i, sim in enumerate(sims):
+                sim.step(directions[row[i]])
+                if sim.over:
+                    sim.reset()
+        scalar = n * ticks / (time.perf_counter() - start)
+        print(f"[bench]   boards={n:>5}  batch={batched:12,.0f}/s  "
+              f"scalar={scalar:12,.0f}/s  x{batched / scalar:.1f}")
+
+
+def bench_seek(length=500000, intervals=(0, 10000, 1000), targets=(1000, 50000, 250000, 500000),
+               cols=40, rows=40):
+    """Recording size and seek latency against replay length per keyframe
+    interval (0 = no keyframes, i.e. re-simulate from tick zero). The board
+    is large enough that the hamiltonian player survives `length` ticks."""
+    from replay import Recorder, Recording
+    from tournament import hamiltonian_policy
+    print(f"[bench] seek: {length:,}-tick hamiltonian game, seek time by target tick")
+    for interval in intervals:
+        sim = Simulation(cols, rows, seed=1, clock=lambda: 0)
+        recorder = Recorder(sim, keyframe_interval=interval)
+        while sim.ticks < length and not sim.over:
+            sim.step(hamiltonian_policy(sim))
+        recording = Recording.from_bytes(recorder.finish())
+        timings = []
+        for target in targets:
+            start = time.perf_counter()
+            recording.seek(target)
+            timings.append(f"{target:>7,}:{(time.perf_counter() - start) * 1000:8.1f}ms")
+        print(f"[bench]   interval={interval:>6}  size={len(recording.data):>9,} B  " + '  '.join(timings))
+
+
+def _cycle_cells(cols, rows):
+    """Cells in the order tournament.hamiltonian_policy visits them."""
+    cells = list(range(cols))
+    for row in range(1, rows):
+        order = range(cols - 1, 0, -1) if row % 2 else range(1, cols)
+        cells.extend(row * cols + col for col in order)
+    cells.extend(row * cols for row in range(rows - 1, 0, -1))
+    return cells
+
+
+def _cycle_sim(cols, rows, length, cycle):
+    """A simulation whose snake of `length` lies along `cycle` (from
+    _cycle_cells) so hamiltonian_policy can keep it moving."""
+    sim = Simulation(cols, rows, seed=1, clock=lambda: 0)
+    cells = cycle[length - 1::-1]
+    delta = cells[0] - cells[1]
+    direction = {1: DIRECTIONS['RIGHT'], -1: DIRECTIONS['LEFT'],
+                 cols: DIRECTIONS['DOWN'], -cols: DIRECTIONS['UP']}[delta]
+    sim.set_state((0, 0, False, direction, False, cycle[-1], cells, sim.rng.getstate()))
+    return sim
+
+
+def _draw_us(renderer, screen, sim, frames):
+    """Mean draw() time in microseconds while the snake keeps moving."""
+    from constants import ACTIVE_THEME
+    from tournament import hamiltonian_policy
+    renderer.draw(screen, sim, ACTIVE_THEME)
+    elapsed = 0.0
+    for _ in range(frames):
+        sim.step(hamiltonian_policy(sim))
+        start = time.perf_counter()
+        renderer.draw(screen, sim, ACTIVE_THEME)
+        elapsed += time.perf_counter() - start
+    return elapsed / frames * 1e6
+
+
+def bench_render(lengths=(3, 100, 400, 800), frames=300):
+    """Per-frame draw cost of each renderer against snake length, on an
+    offscreen surface (presentation is not timed)."""
+    import os
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from constants import GRID_COLS, GRID_ROWS, SCREEN_WIDTH, SCREEN_HEIGHT
+    from render import RENDERERS
+    pygame.init()
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    cycle = _cycle_cells(GRID_COLS, GRID_ROWS)
+    print(f"[bench] render: per-frame draw cost on a {GRID_COLS}x{GRID_ROWS} board")
+    for length in lengths:
+        timings = []
+        for name, renderer_cls in RENDERERS.items():
+            sim = _cycle_sim(GRID_COLS, GRID_ROWS, length, cycle)
+            timings.append(f"{name}={_draw_us(renderer_cls(), screen, sim, frames):8.1f} us")
+        print(f"[bench]   length={length:>4}  " + '  '.join(timings))
+    pygame.quit()
+    fonts.clear()
+
+
+def bench_board(sizes=(30, 100, 300), fills=(0.0, 0.1, 0.5), frames=100):
+    """Per-frame draw cost of the surfarray renderer against board size and
+    snake length, next to the per-segment atlas renderer. On boards larger
+    than the play area the atlas draws cells at full size and SDL clips most
+    of them, so its numbers there are a lower bound."""
+    import os
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+    from render import AtlasRenderer, SurfarrayRenderer
+    pygame.init()
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    print("[bench] board: per-frame draw cost against board size")
+    for size in sizes:
+        cycle = _cycle_cells(size, size)
+        for fill in fills:
+            length = max(3, int(size * size * fill))
+            timings = []
+            for name, renderer_cls in (('surfarray', SurfarrayRenderer), ('atlas', AtlasRenderer)):
+                sim = _cycle_sim(size, size, length, cycle)
+                timings.append(f"{name}={_draw_us(renderer_cls(), screen, sim, frames):9.1f} us")
+            print(f"[bench]   {size:>3}x{size:<3} length={length:>5}  " + '  '.join(timings))
+    pygame.quit()
+    fonts.clear()
+
+
+def bench_text(iterations=500):
+    """Per-frame cost of the GAME_OVER labels: loading fonts and rendering
+    every frame (the old draw) against the shared font and text caches."""
+    import os
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    pygame.init()
+    color = (255, 255, 255)
+
+    def uncached():
+        pygame.font.SysFont(None, 72).render("GAME OVER", True, color)
+        pygame.font.SysFont(None, 48).render("Final Score: 42", True, color)
+
+    def cached():
+        fonts.render_text("GAME OVER", 72, color)
+        fonts.render_text("Final Score: 42", 48, color)
+
+    print("[bench] text: per-frame cost of the GAME_OVER labels")
+    print(f"[bench]   uncached={_per_call_us(uncached, iterations):8.1f} us  "
+          f"cached={_per_call_us(cached, iterations):6.2f} us")
+    pygame.quit()
+    fonts.clear()
+
+
+def bench_idle(seconds=3.0):
+    """CPU use and main-loop wakeups per second while GameManager.run() sits
+    on the pause screen: polling at FPS (the old loop) against the idle
+    scheduler blocking in pygame.event.wait()."""
+    import os
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    from constants import GAME_STATES
+    from game_manager import GameManager
+    pygame.init()
+    gm = GameManager()
+    gm.start_game()
+    scheduler = gm.scheduler
+    wait = scheduler.wait
+    print(f"[bench] idle: {seconds:.0f}s on the pause screen")
+    for name, always_poll in (('poll', True), ('idle', False)):
+        scheduler.wait = (lambda animating=False: wait(True)) if always_poll else wait
+        gm.state = GAME_STATES['PAUSED']
+        gm.running = True
+        pygame.time.set_timer(pygame.QUIT, int(seconds * 1000), 1)
+        wakeups = scheduler.wakeups
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        gm.run()
+        wall = time.perf_counter() - wall
+        cpu = time.process_time() - cpu
+        print(f"[bench]   {name}: cpu={cpu / wall * 100:5.1f}%  "
+              f"wakeups={(scheduler.wakeups - wakeups) / wall:5.1f}/s")
+    scheduler.wait = wait
+    pygame.quit()
+    fonts.clear()
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def bench_threaded(seconds=3.0, tick_ms=10, length=400, flips_ms=(0, 20, 50), fps=30):
+    """Tick jitter and input-to-tick latency of the single-threaded loop
+    against SimulationThread, while a 30 fps render loop draws a long snake
+    with the full renderer and then blocks in a simulated vsync'd flip.
+
+    Jitter is the standard deviation of the time between tick starts and
+    lateness is measured against the ideal fixed `tick_ms` grid. Input
+    latency runs from an input's arrival (every 37 ms, off the frame grid)
+    to the start of the first tick that sees it.
+    """
+    import os
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    from constants import ACTIVE_THEME, GRID_COLS, GRID_ROWS, SCREEN_WIDTH, SCREEN_HEIGHT
+    from render import FullRenderer
+    from threaded import SimulationThread, SnapshotView
+    from tournament import hamiltonian_policy
+    pygame.init()
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    cycle = _cycle_cells(GRID_COLS, GRID_ROWS)
+    print(f"[bench] threaded: {tick_ms} ms ticks, length {length}, {fps} fps full redraws")
+    for flip_ms in flips_ms:
+        for name in ('single', 'threaded'):
+            sim = _cycle_sim(GRID_COLS, GRID_ROWS, length, cycle)
+            sim.tick_ms = tick_ms
+            sim.clock = lambda: int(time.perf_counter() * 1000)
+            sim.reset_clock()
+            handed = deque()
+            tick_times = []
+            latencies = []
+
+            def before_tick(sim):
+                now = time.perf_counter()
+                tick_times.append(now)
+                while handed:
+                    latencies.append(now - handed.popleft())
+                direction = hamiltonian_policy(sim)
+                if direction is not None:
+                    sim.change_direction(direction)
+
+            thread = view = None
+            if name == 'threaded':
+                thread = SimulationThread(sim, before_tick=before_tick)
+                view = SnapshotView(thread)
+                thread.start()
+            renderer = FullRenderer()
+            start = time.perf_counter()
+            next_input = start
+            next_frame = start
+            while time.perf_counter() - start < seconds:
+                next_frame += 1.0 / fps
+                pause = next_frame - time.perf_counter()
+                if pause > 0:
+                    time.sleep(pause)
+                # inputs that arrived since the last poll reach the game now
+                now = time.perf_counter()
+                while next_input <= now:
+                    handed.append(next_input)
+                    next_input += 0.037
+                if thread is None:
+                    sim.update(before_tick=before_tick)
+                    renderer.draw(screen, sim, ACTIVE_THEME)
+                else:
+                    thread.drain_events()
+                    renderer.draw(screen, view.refresh(), ACTIVE_THEME)
+                time.sleep(flip_ms / 1000.0)
+            if thread is not None:
+                thread.stop()
+
+            # lateness against the fixed tick grid, anchored on the earliest tick
+            tick_s = tick_ms / 1000.0
+            grid = [t - i * tick_s for i, t in enumerate(tick_times)]
+            origin = min(grid)
+            lateness = [t - origin for t in grid]
+            intervals = [b - a for a, b in zip(tick_times, tick_times[1:])]
+            mean = sum(intervals) / len(intervals)
+            jitter = (sum((i - mean) ** 2 for i in intervals) / len(intervals)) ** 0.5
+            print(f"[bench]   flip={flip_ms:>2} ms {name:>8}: ticks={len(tick_times):4}  "
+                  f"jitter={jitter * 1e3:5.2f} ms  "
+                  f"lateness p50={_percentile(lateness, 0.5) * 1e3:5.1f} "
+                  f"p99={_percentile(lateness, 0.99) * 1e3:5.1f} ms  "
+                  f"input latency p50={_percentile(latencies, 0.5) * 1e3:5.1f} "
+                  f"p99={_percentile(latencies, 0.99) * 1e3:5.1f} ms")
+    pygame.quit()
+    fonts.clear()
+
+
+def bench_sfx(repeats=5):
+    """Cold-start cost of the two built-in chords: synthesis alone with each
+    backend, then building the mixer Sounds in memory against writing WAV
+    files and loading them back, and loading them from a warm SFX cache
+    (what init_sounds() does on repeat launches)."""
+    import os
+    import tempfile
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    import sounds
+    from sfx_cache import SfxCache
+    chords = list(sounds._builtin_chords().values())
+    backends = [('array', sounds._synthesize_array)]
+    if sounds.np is not None:
+        backends.insert(0, ('numpy', sounds._synthesize_numpy))
+
+    def best_ms(fn):
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best * 1e3
+
+    print("[bench] sfx: building the built-in chords")
+    for name, synthesize in backends:
+        ms = best_ms(lambda: [synthesize(freqs, duration_ms, volume, 44100, sounds._CHORD_ENVELOPE)
+                              for freqs, duration_ms, volume in chords])
+        print(f"[bench]   synthesis {name:>5}: {ms:7.2f} ms")
+
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        print("[bench]   mixer: skipped (no audio device)")
+        return
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'chord.wav')
+
+        def via_file():
+            for freqs, duration_ms, volume in chords:
+                sounds._create_chord_wav(path, freqs, duration_ms, volume)
+                pygame.mixer.Sound(path)
+
+        file_ms = best_ms(via_file)
+        cache = SfxCache(os.path.join(directory, 'cache'))
+        for chord in chords:
+            sounds.make_chord_sound(*chord, cache=cache)
+        cached_ms = best_ms(lambda: [sounds.make_chord_sound(*chord, cache=cache) for chord in chords])
+    memory_ms = best_ms(lambda: [sounds.make_chord_sound(*chord) for chord in chords])
+    print(f"[bench]   Sound via WAV file: {file_ms:7.2f} ms  in memory: {memory_ms:7.2f} ms  "
+          f"from cache: {cached_ms:7.2f} ms")
+    pygame.mixer.quit()
+
+
+def bench_voices(triggers=200, interval_ms=2):
+    """Rapid 'beep' triggers with a death sound in the middle: the old
+    shared-Sound play (volume set, play, volume restored) against the
+    channel pool, counting what got lost and the cost per call."""
+    import os
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    import sounds
+    pygame.mixer.init()
+    sounds.init_sounds(cache=None)
+    beep = sounds.get_sfx('beep')
+    low_beep = sounds.get_sfx('low_beep')
+
+    def legacy(name, volume=1.0):
+        snd = beep if name == 'beep' else low_beep
+        prev = snd.get_volume()
+        snd.set_volume(volume)
+        channel = snd.play()
+        snd.set_volume(prev)
+        return channel is not None
+
+    print(f"[bench] voices: {triggers} beeps {interval_ms} ms apart, one low_beep halfway")
+    reserved = sum(category.channels for category in sounds.SFX_CATEGORIES.values())
+    for name, play in (('Sound.play', legacy), ('pool', sounds.play_sfx)):
+        pygame.mixer.stop()
+        # the old path could use every channel the pool now reserves
+        pygame.mixer.set_reserved(0 if play is legacy else reserved)
+        lost = 0
+        low_played = False
+        elapsed = 0.0
+        for i in range(triggers):
+            start = time.perf_counter()
+            lost += not play('beep', 1.0)
+            if i == triggers // 2:
+                low_played = play('low_beep', 1.0)
+            elapsed += time.perf_counter() - start
+            time.sleep(interval_ms / 1000.0)
+        extra = ''
+        if play is sounds.play_sfx:
+            stats = sounds.sfx_stats()
+            extra = f"  stolen={stats['stolen']} dropped={stats['dropped']}"
+        print(f"[bench]   {name:>10}: {elapsed / triggers * 1e6:6.1f} us/play  "
+              f"beeps lost={lost}  low_beep played={low_played}{extra}")
+    pygame.mixer.quit()
+
+
+BENCHMARKS = {
+    'collision': bench_collision,
+    'respawn': bench_respawn,
+    'memory': bench_memory,
+    'engine': bench_engine,
+    'batch': bench_batch,
+    'seek': bench_seek,
+    'render': bench_render,
+    'board': bench_board,
+    'text': bench_text,
+    'idle': bench_idle,
+    'threaded': bench_threaded,
+    'sfx': bench_sfx,
+    'voices': bench_voices,
+}
+
+
+def main(argv=None):
+    names = (argv if argv is not None else sys.argv[1:]) or list(BENCHMARKS)
+    for name in names:
+        if name not in BENCHMARKS:
+            print(f"[bench] unknown benchmark {name!r}; choose from {', '.join(BENCHMARKS)}")
+            continue
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Mixer channels reserved per SFX category, with voice limiting.
+
+Sound.play() takes whichever mixer channel is free and silently does
+nothing once all of them are busy, and its volume is the Sound's own, shared
+by every play of it. ChannelPool instead gives each category of effects its
+own reserved channels and plays on them with a per-channel volume, so one
+play never changes another.
+
+When a category has no free channel, or `max_voices` effects are already
+playing, the new voice steals the busy voice of lowest priority, oldest
+first, as long as that priority does not exceed its own; otherwise it is
+dropped. `played`, `stolen` and `dropped` count what happened.
+"""
+from collections import namedtuple
+import pygame
+
+# `channels` reserved for a category and the `priority` its voices play at
+Category = namedtuple('Category', 'channels priority')
+
+
+class ChannelPool:
+    """Plays sounds on channels reserved for each of `categories` ({name:
+    Category}); at most `max_voices` at once across all of them (default:
+    every reserved channel). Create it right after initialising the mixer:
+    channels already playing when they are reserved are not tracked."""
+
+    def __init__(self, categories, max_voices=None):
+        self.categories = dict(categories)
+        total = sum(category.channels for category in self.categories.values())
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        # keep Sound.play() and music off the reserved channels
+        pygame.mixer.set_reserved(total)
+        self._channels = {}
+        first = 0
+        for name, category in self.categories.items():
+            self._channels[name] = [pygame.mixer.Channel(i) for i in range(first, first + category.channels)]
+            first += category.channels
+        self.max_voices = total if max_voices is None else max_voices
+        self.volume = 1.0
+        # channel -> (priority, serial, volume) of the voice last started on it
+        self._voices = {}
+        self._serial = 0
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0
+
+    def _reap(self):
+        """Forget voices that finished, leaving `_voices` holding exactly
+        the busy channels (the reserved channels play nothing else)."""
+        voices = self._voices
+        for channel in [channel for channel in voices if not channel.get_busy()]:
+            del voices[channel]
+
+    def _victim(self, channels, priority):
+        """The lowest-priority, oldest voice among `channels` that a voice
+        of `priority` may steal, or None."""
+        victim = None
+        victim_key = None
+        for channel in channels:
+            voice = self._voices.get(channel)
+            if voice is None or voice[0] > priority:
+                continue
+            key = voice[:2]
+            if victim is None or key < victim_key:
+                victim, victim_key = channel, key
+        return victim
+
+    def play(self, sound, category, volume=1.0, priority=None):
+        """Play `sound` on a channel of `category` at `volume` (times the
+        pool's `volume`) and return the Channel, or None if dropped.
+        `priority` overrides the category's."""
+        channels = self._channels[category]
+        if priority is None:
+            priority = self.categories[category].priority
+        self._reap()
+        voices = self._voices
+        free = None
+        for channel in channels:
+            if channel not in voices:
+                free = channel
+                break
+        if free is not None and len(voices) < self.max_voices:
+            channel = free
+        else:
+            # over the voice limit anything may be stolen, otherwise only
+            # this category's own channels
+            victim = self._victim(voices if free is not None else channels, priority)
+            if victim is None:
+                self.dropped += 1
+                return None
+            del voices[victim]
+            self.stolen += 1
+            if free is None:
+                # play() below replaces the voice
+                channel = victim
+            else:
+                victim.stop()
+                channel = free
+        self._serial += 1
+        self._voices[channel] = (priority, self._serial, volume)
+        channel.set_volume(max(0.0, min(1.0, volume * self.volume)))
+        channel.play(sound)
+        self.played += 1
+        return channel
+
+    def set_volume(self, volume):
+        """Set the master volume, applied to the voices playing now too."""
+        self.volume = volume
+        self._reap()
+        for channel in self._voices:
+            channel.set_volume(max(0.0, min(1.0, self._voices[channel][2] * volume)))
+
+    def stats(self):
+        return {'played': self.played, 'stolen': self.stolen, 'dropped': self.dropped}
@@ -1,4 +1,7 @@
-import pygame
+try:
+    import pygame
+except ImportError:  # headless simulation (engine.py) runs without pygame
+    pygame = None
 # Constants stored for game configuration and settings
 
 # Configurable game settings
@@ -50,6 +53,12 @@ MENU_OPTION_FONT_SIZE = 28
 # Center the game area inside the window (adds margins) when True
 CENTER_GAME_AREA = True
 
+# Gameplay renderer: 'dirty' repaints only changed cells, 'full' redraws
+# the whole screen every frame, 'atlas' redraws it by blitting pre-rendered
+# cell tiles in one batch, 'surfarray' builds the board as one NumPy image
+# (no cell outlines; for very large boards)
+RENDERER = 'dirty'
+
 # Audio settings
 # Music Volume
 MUSIC_VOLUME = 1.0  # Music volume level (0.0 to 1.0)
@@ -58,11 +67,19 @@ MUSIC_VOLUME = 1.0  # Music volume level (0.0 to 1.0)
 SFX_VOLUME = 1.0  # Sound effects volume level (0.0 to 1.0)
 
 # Control settings
-UP_KEY = pygame.K_w  # Key for moving up
-DOWN_KEY = pygame.K_s  # Key for moving down
-LEFT_KEY = pygame.K_a  # Key for moving left
-RIGHT_KEY = pygame.K_d  # Key for moving right
-PAUSE_KEY = pygame.K_ESCAPE  # Key for pausing the game
+if pygame is not None:
+    UP_KEY = pygame.K_w  # Key for moving up
+    DOWN_KEY = pygame.K_s  # Key for moving down
+    LEFT_KEY = pygame.K_a  # Key for moving left
+    RIGHT_KEY = pygame.K_d  # Key for moving right
+    PAUSE_KEY = pygame.K_ESCAPE  # Key for pausing the game
+else:
+    # SDL keycodes for the same keys, so settings stay compatible
+    UP_KEY = ord('w')
+    DOWN_KEY = ord('s')
+    LEFT_KEY = ord('a')
+    RIGHT_KEY = ord('d')
+    PAUSE_KEY = 27
 
 # Hard Game Constants
 
@@ -85,9 +102,24 @@ BORDER_SIZE = 5  # Size of the border around the game area in pixels
 # Size of each grid cell
 CELL_SIZE = 20  # Size of each cell in the game grid in pixels
 
+# Grid dimensions in cells (derived from the game area)
+GRID_COLS = GAME_WIDTH // CELL_SIZE
+GRID_ROWS = GAME_HEIGHT // CELL_SIZE
+
 # Frames per second
 FPS = 30  # Frames per second for the game loop
 
+# Longest the menu, pause and game-over screens sleep waiting for input (ms)
+IDLE_TIMEOUT_MS = 1000
+
+# Most simulation time (ms) caught up in one frame after a stall; anything
+# beyond is dropped so a slow frame cannot snowball into slower ones
+MAX_CATCH_UP_MS = 250
+
+# Step the game on its own thread (threaded.py) so slow frames cannot delay
+# ticks; the render loop draws the newest published snapshot
+THREADED_SIMULATION = False
+
 # Directions
 DIRECTIONS = {
     'UP': (0, -1),
@@ -0,0 +1,196 @@
+"""Headless snake simulation.
+
+`Simulation` owns the game rules (snake movement, food, walls, score and game
+over) with no pygame dependency, so games can be stepped without SDL by bots,
+tests and servers. `GameManager` is a thin presenter on top of it.
+"""
+import random
+import time
+from constants import (
+    GRID_COLS,
+    GRID_ROWS,
+    INITIAL_SNAKE_LENGTH,
+    SNAKE_SPEED,
+    MAX_CATCH_UP_MS,
+)
+from objects import Snake, Food
+
+# Events reported by Simulation.step()
+EAT = 'eat'
+WALL = 'wall'
+SELF = 'self'
+
+# step() returns one of these shared tuples so a tick allocates nothing
+NO_EVENTS = ()
+_EAT_EVENTS = (EAT,)
+_WALL_EVENTS = (WALL,)
+_SELF_EVENTS = (SELF,)
+
+
+def monotonic_ms():
+    """Default simulation clock: monotonic time in milliseconds."""
+    return int(time.monotonic() * 1000)
+
+
+class Simulation:
+    """One game of snake on a `cols` x `rows` board.
+
+    `rng` (or `seed`, used to build a private ``random.Random``) drives food
+    placement; without either a fresh 64-bit seed is drawn and kept in
+    `seed` so the game can be reproduced. `clock` is a zero-argument callable
+    returning milliseconds and is only consulted by update().
+
+    An optional `recorder` is called as ``recorder.on_tick(sim)`` at the
+    start of every step, after the direction for that tick is applied.
+
+    Setting `changes` to a list makes step() append every cell whose
+    contents changed (new head, vacated tail, new food) so renderers can
+    redraw incrementally. reset() and set_state() put it back to None to
+    signal that the whole board changed.
+    """
+
+    def __init__(self, cols=GRID_COLS, rows=GRID_ROWS, length=INITIAL_SNAKE_LENGTH,
+                 seed=None, rng=None, clock=monotonic_ms, tick_ms=None):
+        self.cols = cols
+        self.rows = rows
+        self.initial_length = length
+        if rng is None and seed is None:
+            seed = random.getrandbits(64)
+        self.seed = seed
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.recorder = None
+        self.changes = None
+        self.clock = clock
+        self.tick_ms = tick_ms if tick_ms is not None else int(1000 / max(1, SNAKE_SPEED))
+        self.reset()
+
+    def reset(self):
+        """Start a fresh game on the same board."""
+        self.snake = Snake(self.initial_length, self.cols, self.rows)
+        self.food = Food(self.cols, self.rows, rng=self.rng, occupied=self.snake)
+        self.score = 0
+        self.ticks = 0
+        self.over = False
+        self.changes = None
+        self._last_tick_time = self.clock()
+
+    @property
+    def head(self):
+        return self.snake.head
+
+    @property
+    def body(self):
+        """Snake cells, head first."""
+        return self.snake.segments
+
+    @property
+    def food_cell(self):
+        return self.food.cell
+
+    @property
+    def occupancy(self):
+        """Per-cell occupancy counts, row-major (a live bytearray view of
+        the board, not a copy)."""
+        return self.snake.grid.cells
+
+    def is_free(self, cell):
+        return self.snake.grid.is_free(cell)
+
+    def change_direction(self, direction):
+        self.snake.change_direction(direction)
+
+    def step(self, direction=None):
+        """Advance the game by one tick and return a tuple of events.
+
+        `direction` (a DIRECTIONS value) is applied first, with the usual
+        no-reverse rule. Stepping a finished game does nothing.
+        """
+        if self.over:
+            return NO_EVENTS
+        if direction is not None:
+            self.snake.change_direction(direction)
+        if self.recorder is not None:
+            self.recorder.on_tick(self)
+        snake = self.snake
+        self.ticks += 1
+
+        if not snake.move():
+            self.over = True
+            return _WALL_EVENTS
+        changes = self.changes
+        if changes is not None:
+            changes.append(snake.head)
+            if snake.vacated is not None:
+                changes.append(snake.vacated)
+        if snake.check_self_collision():
+            self.over = True
+            return _SELF_EVENTS
+        if snake.head == self.food.cell:
+            self.score += 1
+            snake.grow()
+            self.food.respawn(snake)
+            if changes is not None and self.food.cell is not None:
+                changes.append(self.food.cell)
+            return _EAT_EVENTS
+        return NO_EVENTS
+
+    def get_state(self):
+        """Return a plain tuple with everything needed to resume this game
+        later via set_state() (body cells head first, RNG state included)."""
+        snake = self.snake
+        return (self.ticks, self.score, self.over, snake.direction, snake.grow_flag,
+                self.food.cell, list(snake.segments), self.rng.getstate())
+
+    def set_state(self, state):
+        """Restore a tuple produced by get_state() on a same-sized board.
+
+        The occupancy grid is rebuilt from the body, so its free-cell order
+        (and therefore later food placement) depends only on `state`.
+        """
+        ticks, score, over, direction, grow_flag, food_cell, cells, rng_state = state
+        self.snake = Snake(cols=self.cols, rows=self.rows, cells=cells)
+        self.snake.direction = direction
+        self.snake.grow_flag = grow_flag
+        self.food.cell = food_cell
+        self.rng.setstate(rng_state)
+        self.ticks = ticks
+        self.score = score
+        self.over = over
+        self.changes = None
+
+    def reset_clock(self):
+        """Forget time owed so far, e.g. when resuming from pause."""
+        self._last_tick_time = self.clock()
+
+    def update(self, direction=None, before_tick=None):
+        """Run every tick owed by the clock since the last one (fixed
+        timestep) and return their combined events.
+
+        Ticks stay on a fixed `tick_ms` grid however late update() is
+        called, so the tick rate does not drift with frame timing and may
+        exceed the frame rate. At most MAX_CATCH_UP_MS of simulation is
+        caught up per call; older backlog is dropped. `direction` applies to
+        the first tick; `before_tick(sim)`, if given, runs before each one.
+        """
+        now = self.clock()
+        owed = (now - self._last_tick_time) // self.tick_ms
+        if owed <= 0:
+            return NO_EVENTS
+        cap = max(1, MAX_CATCH_UP_MS // self.tick_ms)
+        if owed > cap:
+            owed = cap
+            self._last_tick_time = now
+        else:
+            self._last_tick_time += owed * self.tick_ms
+
+        events = NO_EVENTS
+        for _ in range(owed):
+            if before_tick is not None:
+                before_tick(self)
+            tick_events = self.step(direction)
+            direction = None
+            if tick_events:
+                events += tick_events
+            if self.over:
+                break
+        return events
@@ -0,0 +1,167 @@
+"""Render games to frames without a display.
+
+Frames are drawn by the same renderers the game window uses (render.py) onto
+an offscreen Surface, under SDL's dummy video driver, one frame per tick and
+as fast as the CPU allows. A game comes from a recording or from a script of
+directions and is written as raw RGB24 frames (to a file, or to a pipe with
+'-') or as a numbered PNG sequence:
+
+    python export.py game.snkr --raw - | ffmpeg -f rawvideo -pix_fmt rgb24 \\
+        -s 760x610 -r 30 -i - game.mp4
+    python export.py game.snkr --png frames/ --every 10
+    python export.py --script moves.txt --seed 7 --png frames/
+
+A script is whitespace-separated tokens, one per tick: UP, DOWN, LEFT, RIGHT
+or '.' to keep going straight, each optionally repeated as TOKEN*N.
+"""
+import argparse
+import os
+import sys
+import time
+
+# the pygame import banner would corrupt raw frames written to stdout
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+from constants import ACTIVE_THEME, DIRECTIONS, RENDERER, SCREEN_WIDTH, SCREEN_HEIGHT  # noqa: E402
+from engine import Simulation  # noqa: E402
+from replay import Recording  # noqa: E402
+
+
+class ScriptError(ValueError):
+    """Raised for malformed input scripts."""
+
+
+def parse_script(text):
+    """Return the per-tick directions (None for straight) of a script."""
+    directions = []
+    for token in text.split():
+        name, _, count = token.partition('*')
+        if name == '.':
+            direction = None
+        elif name.upper() in DIRECTIONS:
+            direction = DIRECTIONS[name.upper()]
+        else:
+            raise ScriptError(f'unknown direction {name!r}')
+        try:
+            repeat = int(count) if count else 1
+        except ValueError:
+            raise ScriptError(f'bad repeat count in {token!r}') from None
+        directions.extend([direction] * repeat)
+    return directions
+
+
+def scripted(directions):
+    """Return a before-tick steer function (see Simulation.update) that
+    applies `directions`, indexed by tick, to the game it is called with."""
+    directions = list(directions)
+
+    def steer(sim):
+        if sim.ticks < len(directions) and directions[sim.ticks] is not None:
+            sim.change_direction(directions[sim.ticks])
+    return steer
+
+
+def frames(sim, ticks, steer=None, renderer=RENDERER, theme=ACTIVE_THEME):
+    """Yield the screen after every tick of `sim` up to `ticks` (the start
+    position first), ending on the game-over screen if the game ends.
+
+    `steer(sim)` runs before each tick (Recording.steer or scripted()). The
+    same offscreen Surface is yielded every time: copy it to keep a frame.
+    pygame must be initialised; no display mode is needed.
+    """
+    import pygame
+    from render import make_renderer, OverlayCache, game_over_lines
+
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    board = make_renderer(renderer)
+    board.draw(screen, sim, theme)
+    yield screen
+    while sim.ticks < ticks and not sim.over:
+        if steer is not None:
+            steer(sim)
+        sim.step()
+        board.draw(screen, sim, theme)
+        yield screen
+    if sim.over:
+        screen.blit(OverlayCache().frame('game_over', screen, sim, theme,
+                                         game_over_lines(sim.score)), (0, 0))
+        yield screen
+
+
+def write_raw(surfaces, out, every=1):
+    """Write every `every`th surface to binary stream `out` as packed RGB24
+    rows; return the number of frames written."""
+    import pygame
+    written = 0
+    for i, surface in enumerate(surfaces):
+        if i % every == 0:
+            out.write(pygame.image.tobytes(surface, 'RGB'))
+            written += 1
+    out.flush()
+    return written
+
+
+def write_png(surfaces, directory, every=1):
+    """Save every `every`th surface as directory/frame_NNNNNN.png (numbered
+    consecutively); return the number of frames written."""
+    import pygame
+    os.makedirs(directory, exist_ok=True)
+    written = 0
+    for i, surface in enumerate(surfaces):
+        if i % every == 0:
+            pygame.image.save(surface, os.path.join(directory, f'frame_{written:06d}.png'))
+            written += 1
+    return written
+
+
+def main(argv=None):
+    from render import RENDERERS
+    parser = argparse.ArgumentParser(description='Render a snake game to frames without a display.')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('recording', nargs='?', help='recording file')
+    source.add_argument('--script', help="script file of per-tick directions ('-' for stdin)")
+    parser.add_argument('--seed', type=int, default=0, help='game seed for --script')
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument('--raw', help="write raw RGB24 frames to this file ('-' for stdout)")
+    output.add_argument('--png', help='write a PNG sequence into this directory')
+    parser.add_argument('--every', type=int, default=1, help='keep only every Nth frame')
+    parser.add_argument('--renderer', default=RENDERER, choices=sorted(RENDERERS),
+                        help='renderer to draw with')
+    args = parser.parse_args(argv)
+
+    if args.recording:
+        recording = Recording.load(args.recording)
+        sim = recording.new_simulation()
+        ticks, steer = recording.total_ticks, recording.steer
+    else:
+        if args.script == '-':
+            text = sys.stdin.read()
+        else:
+            with open(args.script) as f:
+                text = f.read()
+        directions = parse_script(text)
+        sim = Simulation(seed=args.seed)
+        ticks, steer = len(directions), scripted(directions)
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    pygame.init()
+    start = time.perf_counter()
+    surfaces = frames(sim, ticks, steer, renderer=args.renderer)
+    every = max(1, args.every)
+    if args.png:
+        written = write_png(surfaces, args.png, every)
+    elif args.raw == '-':
+        written = write_raw(surfaces, sys.stdout.buffer, every)
+    else:
+        with open(args.raw, 'wb') as out:
+            written = write_raw(surfaces, out, every)
+    elapsed = time.perf_counter() - start
+    pygame.quit()
+    # stderr, so raw frames on stdout stay clean
+    print(f"[export] {written} frames of {SCREEN_WIDTH}x{SCREEN_HEIGHT} ticks={sim.ticks} "
+          f"score={sim.score} over={sim.over} in {elapsed:.3f}s "
+          f"({written / max(elapsed, 1e-9):.0f} fps)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
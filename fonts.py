@@ -0,0 +1,82 @@
+"""Process-wide font registry and a cache of rendered text surfaces.
+
+Loading a font and rendering text are both slow compared to a blit, and the
+game draws the same few labels ("Score: 3", "PAUSED", menu options) every
+frame. get_font() hands out one shared Font per (name, size) and
+render_text() keeps the most recently used text surfaces, so a label that
+has not changed costs a dictionary lookup.
+
+Fonts and surfaces belong to the current pygame session: call clear() after
+pygame.quit() if pygame is initialised again.
+"""
+from collections import OrderedDict
+import pygame
+
+# Rendered text surfaces kept before the least recently used is dropped
+TEXT_CACHE_SIZE = 256
+
+_fonts = {}
+
+
+def get_font(size, name=None):
+    """Return the shared Font for `name` at `size` pixels.
+
+    `name` None is pygame's default font (what SysFont(None, size) returns,
+    without scanning the system font list); anything else goes through
+    SysFont.
+    """
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.Font(None, size) if name is None else pygame.font.SysFont(name, size)
+        _fonts[key] = font
+    return font
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by font, text, color and
+    antialiasing, holding at most `max_entries` surfaces.
+
+    Surfaces are shared: blit them, never draw on them.
+    """
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+text_cache = TextCache()
+
+
+def render_text(text, size, color, name=None, antialias=True):
+    """Render `text` with the shared font for (`name`, `size`), reusing a
+    cached surface when the same label was drawn recently."""
+    return text_cache.render(get_font(size, name), text, color, antialias)
+
+
+def clear():
+    """Drop every cached font and surface (e.g. after pygame.quit())."""
+    _fonts.clear()
+    text_cache.clear()
@@ -32,13 +32,14 @@ def draw_border(screen, theme):
 def draw_snake(screen, snake, theme):
     """Draw the snake segments onto the given screen."""
     snake_color = theme.get("snake_color", (0, 255, 0))
-    for segment in snake.segments:
+    for cell in snake.segments:
+        row, col = divmod(cell, snake.cols)
         pygame.draw.rect(
             screen,
             snake_color,
             (
-                BORDER_SIZE + segment.x * CELL_SIZE,
-                BORDER_SIZE + segment.y * CELL_SIZE,
+                BORDER_SIZE + col * CELL_SIZE,
+                BORDER_SIZE + row * CELL_SIZE,
                 CELL_SIZE,
                 CELL_SIZE,
             ),
@@ -5,7 +5,6 @@ from constants import (
     SCREEN_WIDTH,
     SCREEN_HEIGHT,
     GAME_TITLE,
-    FPS,
     MUSIC_VOLUME,
     SFX_VOLUME,
     UP_KEY,
@@ -16,15 +15,15 @@ from constants import (
     GAME_STATES,
     ACTIVE_THEME,
     FULLSCREEN_MODE,
-    SNAKE_SPEED,
-    BORDER_SIZE,
-    GAME_WIDTH,
-    GAME_HEIGHT,
-    CELL_SIZE,
     DIRECTIONS,
-    CENTER_GAME_AREA,
+    RENDERER,
+    THREADED_SIMULATION,
 )
-from objects import Snake, Food
+from engine import Simulation, EAT, WALL, SELF
+from render import make_renderer, OverlayCache, PAUSED_LINES, game_over_lines
+from replay import Recorder, Recording
+from scheduler import IdleScheduler
+from threaded import SimulationThread, SnapshotView
 from sounds import play_sfx, init_sounds, set_bgm_volume, set_sfx_volume
 
 
@@ -36,9 +35,17 @@ class GameManager:
 
     def __init__(self):
         # initialize pygame display and clock
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.screen = None
+        self._set_display_mode((SCREEN_WIDTH, SCREEN_HEIGHT), fullscreen=False)
+        # everything draws into this fixed logical screen; present() shows it
+        # in the window, so window size and mode changes rebuild nothing
+        self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
         pygame.display.set_caption(GAME_TITLE)
         self.clock = pygame.time.Clock()
+        # paces gameplay frames and sleeps between inputs everywhere else
+        self.scheduler = IdleScheduler(self.clock, event_filter=self._to_logical)
+        self.renderer = make_renderer(RENDERER)
+        self.overlays = OverlayCache()
 
         # initialize sounds early to avoid first-play hiccup
         try:
@@ -79,203 +86,230 @@ class GameManager:
         self.theme = ACTIVE_THEME
         self.fullscreen = FULLSCREEN_MODE
 
-        # gameplay objects (created when a game starts)
-        self.snake = None
-        self.food = None
-        self.score = 0
-        # movement timing (ms)
-        self.move_delay = int(1000 / max(1, SNAKE_SPEED))
-        self._last_move_time = 0
+        # gameplay simulation (created when a game starts); with
+        # THREADED_SIMULATION it runs on `sim_thread` and is drawn from `view`
+        self.sim = None
+        self.sim_thread = None
+        self.view = None
+        # every game is recorded; `replay` is set while watching a recording
+        self.recorder = None
+        self.replay = None
+        self.last_recording = None
+        self._replay_path = os.path.join(os.path.dirname(__file__), 'replays', 'last_game.snkr')
 
     def run(self):
+        drawn_state = None
         while self.running:
-            self.handle_events()
+            # only gameplay animates; the other screens change on input alone
+            animating = self.state == GAME_STATES['PLAYING']
+            events = self.scheduler.wait(animating)
+            self.handle_events(events)
             self.update()
-            self.draw()
-            self.clock.tick(FPS)
+            if animating or events or self.state != drawn_state:
+                self.draw()
+                drawn_state = self.state
 
-    def handle_events(self):
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        for event in pygame.event.get() if events is None else events:
             if event.type == pygame.QUIT:
                 self.quit_game()
             # route keyboard input during gameplay
             if event.type == pygame.KEYDOWN and self.state == GAME_STATES['PLAYING']:
-                # ensure snake exists before calling its methods (static analyzers may warn)
-                if self.snake:
+                # ensure a game exists before steering it (static analyzers may warn)
+                if self.sim and not self.replay:
+                    # the simulation thread owns the game while it runs
+                    steer = self.sim_thread or self.sim
                     if event.key == self.keys.get('up'):
-                        self.snake.change_direction(DIRECTIONS['UP'])
+                        steer.change_direction(DIRECTIONS['UP'])
                     elif event.key == self.keys.get('down'):
-                        self.snake.change_direction(DIRECTIONS['DOWN'])
+                        steer.change_direction(DIRECTIONS['DOWN'])
                     elif event.key == self.keys.get('left'):
-                        self.snake.change_direction(DIRECTIONS['LEFT'])
+                        steer.change_direction(DIRECTIONS['LEFT'])
                     elif event.key == self.keys.get('right'):
-                        self.snake.change_direction(DIRECTIONS['RIGHT'])
+                        steer.change_direction(DIRECTIONS['RIGHT'])
                 if event.key == self.keys.get('pause'):
                     self.state = GAME_STATES['PAUSED']
+                    if self.sim_thread:
+                        self.sim_thread.pause()
             elif event.type == pygame.KEYDOWN and self.state == GAME_STATES['PAUSED']:
                 if event.key == PAUSE_KEY:
                     self.state = GAME_STATES['PLAYING']
+                    # don't replay the paused time as catch-up ticks
+                    if self.sim_thread:
+                        self.sim_thread.resume()
+                    elif self.sim:
+                        self.sim.reset_clock()
             elif event.type == pygame.KEYDOWN and self.state == GAME_STATES['GAME_OVER']:
                 # Allow returning to main menu from Game Over with the Pause/ESC key
                 if event.key == PAUSE_KEY:
                     self.back_to_menu()
 
     def update(self):
-        # game update logic
-        if self.state != GAME_STATES['PLAYING']:
+        # game rules live in the Simulation; this only reacts to its events
+        if self.state != GAME_STATES['PLAYING'] or not self.sim:
             return
 
-        now = pygame.time.get_ticks()
-        if now - self._last_move_time < self.move_delay:
-            return
-        self._last_move_time = now
-
-        # move snake
-        if self.snake:
-            self.snake.move()
-
-            # check wall collisions
-            head = self.snake.head
-            # check for wall collisions (split expressions for readability)
-            hit_left = head.x < BORDER_SIZE
-            hit_top = head.y < BORDER_SIZE
-            hit_right = head.x >= (BORDER_SIZE + GAME_WIDTH)
-            hit_bottom = head.y >= (BORDER_SIZE + GAME_HEIGHT)
-            if hit_left or hit_top or hit_right or hit_bottom:
-                try:
-                    play_sfx('low_beep', volume=SFX_VOLUME)
-                except Exception:
-                    pass
-                self.state = GAME_STATES['GAME_OVER']
-                return
+        if self.sim_thread:
+            # ticks ran on their own schedule; collect what happened since
+            events = self.sim_thread.drain_events()
+        else:
+            # runs every tick owed since the last frame (fixed timestep)
+            events = self.sim.update(before_tick=self.replay.steer if self.replay else None)
+        if WALL in events or SELF in events:
+            try:
+                play_sfx('low_beep')
+            except Exception:
+                pass
+            self.state = GAME_STATES['GAME_OVER']
+            self._stop_sim_thread()
+            self._finish_recording()
+        elif EAT in events:
+            # play food-eaten sound (best-effort)
+            try:
+                # use centralized sounds manager
+                play_sfx('beep')
+            except Exception:
+                # don't let sound errors disrupt the game
+                pass
 
-            # check self collision
-            if self.snake.check_self_collision():
-                try:
-                    play_sfx('low_beep', volume=SFX_VOLUME)
-                except Exception:
-                    pass
-                self.state = GAME_STATES['GAME_OVER']
-                return
-
-            # check food collision
-            if self.food:
-                p = getattr(self.food, 'position', None)
-                if p is not None and head.x == p.x and head.y == p.y:
-                    self.score += 1
-                    self.snake.grow()
-                    self.food.respawn(self.snake.segments)
-                    # play food-eaten sound (best-effort)
-                    try:
-                        # use centralized sounds manager
-                        play_sfx('beep', volume=SFX_VOLUME)
-                    except Exception:
-                        # don't let sound errors disrupt the game
-                        pass
+    @property
+    def score(self):
+        return self.sim.score if self.sim else 0
 
-    def draw(self):
-        # clear background
-        self.screen.fill(self.theme.get('background_color', (0, 0, 0)))
+    @property
+    def board(self):
+        """What renderers draw: the game, or its newest snapshot when it
+        runs on the simulation thread."""
+        return self.view.refresh() if self.view else self.sim
 
-        # compute area offset to center the game area inside the window
-        if CENTER_GAME_AREA:
-            area_x = (SCREEN_WIDTH - (GAME_WIDTH + 2 * BORDER_SIZE)) // 2
-            area_y = (SCREEN_HEIGHT - (GAME_HEIGHT + 2 * BORDER_SIZE)) // 2
-        else:
-            area_x = 0
-            area_y = 0
+    def draw(self):
+        if self.state == GAME_STATES['PLAYING'] and self.sim:
+            # the renderer returns the rects it touched, or None after a full redraw
+            rects = self.renderer.draw(self.screen, self.board, self.theme)
+            if rects is None or rects:
+                self.present(rects)
+            return
+        # anything else paints over the board, so the renderer must start over
+        self.renderer.invalidate()
 
         # draw based on state
-        if self.state == GAME_STATES['MENU']:
-            # menu drawing handled by Menu class; keep background only
-            pass
-        elif self.state == GAME_STATES['PLAYING']:
-            # draw border
-            border_color = self.theme.get('border_color', (255, 255, 255))
-            # top
-            top_rect = (area_x, area_y, GAME_WIDTH + 2 * BORDER_SIZE, BORDER_SIZE)
-            pygame.draw.rect(self.screen, border_color, top_rect)
-            # bottom
-            bottom_rect = (area_x, area_y + GAME_HEIGHT + BORDER_SIZE, GAME_WIDTH + 2 * BORDER_SIZE, BORDER_SIZE)
-            pygame.draw.rect(self.screen, border_color, bottom_rect)
-            # left
-            left_rect = (area_x, area_y, BORDER_SIZE, GAME_HEIGHT + 2 * BORDER_SIZE)
-            pygame.draw.rect(self.screen, border_color, left_rect)
-            # right
-            right_rect = (area_x + GAME_WIDTH + BORDER_SIZE, area_y, BORDER_SIZE, GAME_HEIGHT + 2 * BORDER_SIZE)
-            pygame.draw.rect(self.screen, border_color, right_rect)
-
-            # draw food
-            if self.food:
-                p = getattr(self.food, 'position', None)
-                if p is not None:
-                    food_color = self.theme.get('food_color', (255, 0, 0))
-                    fx = area_x + p.x
-                    fy = area_y + p.y
-                    pygame.draw.rect(self.screen, food_color, (fx, fy, CELL_SIZE, CELL_SIZE))
-                    pygame.draw.rect(self.screen, (0, 0, 0), (fx, fy, CELL_SIZE, CELL_SIZE), 1)
-
-            # draw snake
-            if self.snake:
-                snake_color = self.theme.get('snake_color', (0, 255, 0))
-                for seg in self.snake.segments:
-                    sx = area_x + seg.x
-                    sy = area_y + seg.y
-                    pygame.draw.rect(self.screen, snake_color, (sx, sy, CELL_SIZE, CELL_SIZE))
-                    pygame.draw.rect(self.screen, (0, 0, 0), (sx, sy, CELL_SIZE, CELL_SIZE), 1)
-
-            # draw score
-            font = pygame.font.SysFont(None, 36)
-            text_color = self.theme.get('text_color', (255, 255, 255))
-            score_surf = font.render(f"Score: {self.score}", True, text_color)
-            self.screen.blit(score_surf, (area_x + BORDER_SIZE + 10, area_y + BORDER_SIZE + 10))
-
-        elif self.state == GAME_STATES['PAUSED']:
-            # draw pause overlay
-            overlay = pygame.Surface((GAME_WIDTH, GAME_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 150))
-            self.screen.blit(overlay, (area_x + BORDER_SIZE, area_y + BORDER_SIZE))
-            font = pygame.font.SysFont(None, 72)
-            text_color = self.theme.get('text_color', (255, 255, 255))
-            pause_surf = font.render("PAUSED", True, text_color)
-            pause_cx = area_x + BORDER_SIZE + GAME_WIDTH // 2
-            pause_cy = area_y + BORDER_SIZE + GAME_HEIGHT // 2
-            pause_rect = pause_surf.get_rect(center=(pause_cx, pause_cy))
-            self.screen.blit(pause_surf, pause_rect)
-
+        if self.state == GAME_STATES['PAUSED']:
+            # composed once from the frozen board, then re-blitted as is
+            frame = self.overlays.frame('paused', self.screen, self.board, self.theme, PAUSED_LINES)
+            self.screen.blit(frame, (0, 0))
         elif self.state == GAME_STATES['GAME_OVER']:
-            overlay = pygame.Surface((GAME_WIDTH, GAME_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 150))
-            self.screen.blit(overlay, (area_x + BORDER_SIZE, area_y + BORDER_SIZE))
-            font = pygame.font.SysFont(None, 72)
-            text_color = self.theme.get('text_color', (255, 255, 255))
-            game_over_surf = font.render("GAME OVER", True, text_color)
-            game_over_cx = area_x + BORDER_SIZE + GAME_WIDTH // 2
-            game_over_cy = area_y + BORDER_SIZE + GAME_HEIGHT // 2
-            game_over_rect = game_over_surf.get_rect(center=(game_over_cx, game_over_cy - 40))
-            self.screen.blit(game_over_surf, game_over_rect)
-            score_font = pygame.font.SysFont(None, 48)
-            score_surf = score_font.render(f"Final Score: {self.score}", True, text_color)
-            score_rect = score_surf.get_rect(center=(game_over_cx, game_over_cy + 40))
-            self.screen.blit(score_surf, score_rect)
-
-        pygame.display.flip()
+            frame = self.overlays.frame('game_over', self.screen, self.board, self.theme,
+                                        game_over_lines(self.score))
+            self.screen.blit(frame, (0, 0))
+        else:
+            # menu drawing handled by Menu class; keep background only
+            self.screen.fill(self.theme.get('background_color', (0, 0, 0)))
+
+        self.present()
+
+    def present(self, rects=None):
+        # show the logical screen in the window; `rects` limits the copy to
+        # the regions that changed (a scaled window always gets every pixel)
+        if self._scale_to is not None:
+            pygame.transform.scale(self.screen, self._scale_to, self.window)
+            pygame.display.flip()
+        elif rects is None:
+            self.window.blit(self.screen, (0, 0))
+            pygame.display.flip()
+        else:
+            for rect in rects:
+                self.window.blit(self.screen, rect, rect)
+            pygame.display.update(rects)
+
+    def _set_display_mode(self, size, fullscreen):
+        logical = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        flags = pygame.FULLSCREEN if fullscreen else 0
+        self._scale_to = None
+        if not fullscreen and tuple(size) == logical:
+            self.window = pygame.display.set_mode(logical)
+        else:
+            try:
+                # SDL scales the logical-size surface to the window on the
+                # GPU, so a bigger window or fullscreen costs no extra CPU
+                from pygame._sdl2.video import Window
+                self.window = pygame.display.set_mode(logical, flags | pygame.SCALED)
+                if not fullscreen:
+                    Window.from_display_module().size = size
+            except (ImportError, AttributeError, pygame.error):
+                self.window = pygame.display.set_mode(logical if fullscreen else size, flags)
+        if self.window.get_size() != logical:
+            # no GPU scaling available: one scale blit per frame instead
+            self._scale_to = self.window.get_size()
+        self.window_size = tuple(size)
+        if self.screen is not None:
+            self.present()
+
+    def _to_logical(self, events):
+        # mouse positions arrive in window pixels; the menus hit-test in
+        # logical ones
+        if self._scale_to is not None:
+            sx = SCREEN_WIDTH / self._scale_to[0]
+            sy = SCREEN_HEIGHT / self._scale_to[1]
+            for event in events:
+                pos = getattr(event, 'pos', None)
+                if pos is not None:
+                    event.pos = (int(pos[0] * sx), int(pos[1] * sy))
+        return events
 
     # ---- Methods the menu expects (safe stubs) ----
     def start_game(self):
         # initialize gameplay state
-        self.snake = Snake()
-        self.food = Food()
-        # ensure food not on snake
-        self.food.respawn(self.snake.segments)
-        self.score = 0
-        self._last_move_time = pygame.time.get_ticks()
+        self._stop_sim_thread()
+        self.sim = Simulation(clock=pygame.time.get_ticks)
+        self.recorder = Recorder(self.sim)
+        self.replay = None
+        self._start_sim_thread()
+        self.state = GAME_STATES['PLAYING']
+
+    def start_replay(self, recording):
+        # watch a recorded game (Recording, bytes or a file path) at real speed
+        if isinstance(recording, (bytes, bytearray)):
+            recording = Recording.from_bytes(recording)
+        elif isinstance(recording, str):
+            recording = Recording.load(recording)
+        self._stop_sim_thread()
+        self.sim = recording.new_simulation(clock=pygame.time.get_ticks)
+        self.recorder = None
+        self.replay = recording
+        self._start_sim_thread()
         self.state = GAME_STATES['PLAYING']
 
+    def _start_sim_thread(self):
+        if not THREADED_SIMULATION:
+            return
+        self.sim_thread = SimulationThread(self.sim, before_tick=self.replay.steer if self.replay else None)
+        self.view = SnapshotView(self.sim_thread)
+        self.sim_thread.start()
+
+    def _stop_sim_thread(self):
+        # the view keeps the last snapshot for the game-over screen
+        if self.sim_thread:
+            self.sim_thread.stop()
+            self.sim_thread = None
+
+    def _finish_recording(self):
+        if not self.recorder:
+            return
+        self.last_recording = self.recorder.finish()
+        self.recorder = None
+        # keep the most recent game on disk (best-effort)
+        try:
+            os.makedirs(os.path.dirname(self._replay_path), exist_ok=True)
+            with open(self._replay_path, 'wb') as f:
+                f.write(self.last_recording)
+        except Exception:
+            pass
+
     def open_settings(self):
         self.state = GAME_STATES['PAUSED']
 
     def quit_game(self):
+        self._stop_sim_thread()
         self.running = False
 
     def change_resolution(self, resolution):
@@ -286,27 +320,28 @@ class GameManager:
             w, h = resolution
         else:
             return
-        # update display surface
-        self.screen = pygame.display.set_mode((w, h), pygame.FULLSCREEN if self.fullscreen else 0)
+        # update the window; the logical screen keeps its size
+        self._set_display_mode((w, h), self.fullscreen)
 
     def apply_graphics_settings(self, new_resolution, fullscreen_mode=False):
         self.fullscreen = bool(fullscreen_mode)
-        flags = pygame.FULLSCREEN if self.fullscreen else 0
         w, h = new_resolution
-        self.screen = pygame.display.set_mode((w, h), flags)
+        self._set_display_mode((w, h), self.fullscreen)
 
     def toggle_fullscreen(self):
         self.fullscreen = not self.fullscreen
-        flags = pygame.FULLSCREEN if self.fullscreen else 0
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), flags)
+        # leaving fullscreen restores the chosen window size
+        self._set_display_mode(self.window_size, self.fullscreen)
 
     def back_to_menu(self):
         # Reset gameplay state and return to main menu
         self.state = GAME_STATES['MENU']
-        self.snake = None
-        self.food = None
-        self.score = 0
-        self._last_move_time = 0
+        self._stop_sim_thread()
+        self.sim = None
+        self.view = None
+        self.recorder = None
+        self.replay = None
+        self.overlays.clear()
 
         # Open the Menu so the player sees the main menu UI immediately.
         # Import locally to avoid circular imports at module level.
@@ -398,7 +433,7 @@ class GameManager:
             'music_volume': self.music_volume,
             'sfx_volume': self.sfx_volume,
             'keys': {k: int(v) for k, v in self.keys.items()},
-            'resolution': [SCREEN_WIDTH, SCREEN_HEIGHT],
+            'resolution': list(self.window_size),
             'fullscreen': bool(self.fullscreen),
         }
         try:
@@ -1,88 +1,222 @@
 import random
+from array import array
 from constants import (
     INITIAL_SNAKE_LENGTH,
-    GAME_WIDTH,
-    GAME_HEIGHT,
-    CELL_SIZE,
-    BORDER_SIZE,
+    GRID_COLS,
+    GRID_ROWS,
     DIRECTIONS,
 )
 
+# Cells are packed integers ``row * cols + col`` in grid coordinates. Pixel
+# positions (which include BORDER_SIZE and the window offset) are only
+# computed by the renderer.
 
-class Point:
-    def __init__(self, x: int, y: int):
-        self.x = x
-        self.y = y
 
-    def __eq__(self, other):
-        return isinstance(other, Point) and self.x == other.x and self.y == other.y
+class Grid:
+    """Occupancy counts for every cell of the play area.
+
+    Cells are indexed row-major (``row * cols + col``) so every lookup is a
+    single bytearray access, independent of the snake length. Free cells are
+    also kept in a swap-remove array (with a cell -> slot map) so a uniformly
+    random free cell can be drawn in constant time.
+    """
+
+    def __init__(self, cols=GRID_COLS, rows=GRID_ROWS):
+        self.cols = cols
+        self.rows = rows
+        self.cells = bytearray(cols * rows)
+        # free[:free_count] holds every unoccupied cell; slot[cell] is its
+        # position in that prefix (-1 once occupied)
+        self.free = array('i', range(cols * rows))
+        self.slot = array('i', range(cols * rows))
+        self.free_count = cols * rows
+
+    def occupy(self, index):
+        if not self.cells[index]:
+            # swap-remove from the free list
+            pos = self.slot[index]
+            last = self.free[self.free_count - 1]
+            self.free[pos] = last
+            self.slot[last] = pos
+            self.slot[index] = -1
+            self.free_count -= 1
+        self.cells[index] += 1
+
+    def release(self, index):
+        self.cells[index] -= 1
+        if not self.cells[index]:
+            self.free[self.free_count] = index
+            self.slot[index] = self.free_count
+            self.free_count += 1
+
+    def is_free(self, index):
+        return not self.cells[index]
+
+    def set_free_order(self, cells):
+        """Reorder the free list to `cells`, which must hold every free cell
+        exactly once (e.g. a saved ``free[:free_count]``)."""
+        cells = list(cells)
+        if (len(cells) != self.free_count or len(set(cells)) != len(cells)
+                or not all(0 <= cell < len(self.cells) and not self.cells[cell] for cell in cells)):
+            raise ValueError('cells are not the free cells of this grid')
+        for pos, cell in enumerate(cells):
+            self.free[pos] = cell
+            self.slot[cell] = pos
+
+    def random_free(self, rng=random):
+        """Return a uniformly chosen free cell index, or None if the board is
+        full."""
+        if not self.free_count:
+            return None
+        return self.free[rng.randrange(self.free_count)]
+
+
+class SegmentRing:
+    """Fixed-capacity ring buffer of cell indices, ordered head first.
+
+    Backed by a preallocated ``array('i')`` so pushing a head and popping the
+    tail are O(1) and the whole body costs 4 bytes per cell.
+    """
+
+    def __init__(self, capacity, cells=()):
+        self.buf = array('i', bytes(4 * capacity))
+        self.capacity = capacity
+        self.start = 0
+        self.length = 0
+        # `cells` is given head first; push from the tail end
+        for cell in reversed(list(cells)):
+            self.push_head(cell)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.length
+        if not 0 <= i < self.length:
+            raise IndexError('segment index out of range')
+        return self.buf[(self.start + i) % self.capacity]
+
+    def __iter__(self):
+        end = self.start + self.length
+        if end <= self.capacity:
+            return iter(self.buf[self.start:end])
+        return iter(self.buf[self.start:] + self.buf[:end - self.capacity])
+
+    def push_head(self, cell):
+        if self.length == self.capacity:
+            raise IndexError('segment ring is full')
+        self.start = (self.start - 1) % self.capacity
+        self.buf[self.start] = cell
+        self.length += 1
+
+    def pop_tail(self):
+        if not self.length:
+            raise IndexError('pop from empty segment ring')
+        self.length -= 1
+        return self.buf[(self.start + self.length) % self.capacity]
 
 
 class Snake:
-    def __init__(self, length=INITIAL_SNAKE_LENGTH):
-        # start in the center of the play area, aligned to the grid
-        cols = GAME_WIDTH // CELL_SIZE
-        rows = GAME_HEIGHT // CELL_SIZE
-        center_col = cols // 2
-        center_row = rows // 2
-        start_x = BORDER_SIZE + center_col * CELL_SIZE
-        start_y = BORDER_SIZE + center_row * CELL_SIZE
-
-        self.segments = [Point(start_x - i * CELL_SIZE, start_y) for i in range(length)]
+    def __init__(self, length=INITIAL_SNAKE_LENGTH, cols=GRID_COLS, rows=GRID_ROWS, cells=None):
+        self.cols = cols
+        self.rows = rows
+        if cells is None:
+            # start in the center of the play area
+            center_col = cols // 2
+            center_row = rows // 2
+            start = center_row * cols + center_col
+            cells = [start - i for i in range(length)]
+
+        # one spare slot: the head is pushed before the tail is popped
+        self.segments = SegmentRing(cols * rows + 1, cells)
+        # occupancy grid kept in sync with segments by move()
+        self.grid = Grid(cols, rows)
+        for cell in self.segments:
+            self.grid.occupy(cell)
         # initial movement to the right
         self.direction = DIRECTIONS['RIGHT']
+        # direction of the last move, which turns are checked against
+        self.heading = self._body_heading()
         self.grow_flag = False
+        # tail cell vacated by the last move (None when the snake grew)
+        self.vacated = None
 
     @property
     def head(self):
-        return self.segments[0]
+        return self.segments.buf[self.segments.start]
+
+    @property
+    def tail(self):
+        return self.segments[-1]
+
+    def _body_heading(self):
+        """Direction from the second segment to the head (RIGHT for a
+        one-cell snake)."""
+        if len(self.segments) < 2:
+            return DIRECTIONS['RIGHT']
+        delta = self.segments[0] - self.segments[1]
+        for direction in DIRECTIONS.values():
+            if delta == direction[0] + direction[1] * self.cols:
+                return direction
+        return DIRECTIONS['RIGHT']
 
     def change_direction(self, new_dir):
-        # prevent reversing into itself
-        if new_dir[0] == -self.direction[0] and new_dir[1] == -self.direction[1]:
+        # prevent reversing into itself; checked against the last move, not
+        # the pending direction, so two quick turns cannot add up to one
+        if new_dir[0] == -self.heading[0] and new_dir[1] == -self.heading[1]:
             return
         self.direction = new_dir
 
     def move(self):
-        new_x = self.head.x + self.direction[0] * CELL_SIZE
-        new_y = self.head.y + self.direction[1] * CELL_SIZE
-        new_head = Point(new_x, new_y)
-        self.segments.insert(0, new_head)
+        """Advance one cell. Returns False, leaving the snake in place, when
+        the move would leave the play area."""
+        dx, dy = self.direction
+        head = self.segments.buf[self.segments.start]
+        col = head % self.cols + dx
+        new_head = head + dx + dy * self.cols
+        if not (0 <= col < self.cols and 0 <= new_head < self.cols * self.rows):
+            return False
+        self.segments.push_head(new_head)
+        self.grid.occupy(new_head)
+        self.heading = self.direction
         if self.grow_flag:
             self.grow_flag = False
+            self.vacated = None
         else:
-            self.segments.pop()
+            tail = self.segments.pop_tail()
+            self.grid.release(tail)
+            self.vacated = tail
+        return True
 
     def grow(self):
         self.grow_flag = True
 
     def check_self_collision(self):
-        head = self.head
-        return any(seg.x == head.x and seg.y == head.y for seg in self.segments[1:])
+        # the head cell is counted once for the head itself; a second count
+        # means another segment shares it
+        return self.grid.cells[self.segments.buf[self.segments.start]] > 1
 
 
 class Food:
-    def __init__(self):
-        self.position = None
-        self.respawn([])
-
-    def respawn(self, occupied_segments):
-        cols = GAME_WIDTH // CELL_SIZE
-        rows = GAME_HEIGHT // CELL_SIZE
-        max_attempts = cols * rows
-        attempts = 0
-        while attempts < max_attempts:
-            c = random.randrange(cols)
-            r = random.randrange(rows)
-            x = BORDER_SIZE + c * CELL_SIZE
-            y = BORDER_SIZE + r * CELL_SIZE
-            p = Point(x, y)
-            if not any(p == s for s in occupied_segments):
-                self.position = p
-                return
-            attempts += 1
-        # fallback: place at center
-        self.position = Point(
-            BORDER_SIZE + (cols // 2) * CELL_SIZE,
-            BORDER_SIZE + (rows // 2) * CELL_SIZE,
-        )
+    def __init__(self, cols=GRID_COLS, rows=GRID_ROWS, rng=random, occupied=()):
+        self.cols = cols
+        self.rows = rows
+        self.rng = rng
+        self.cell = None
+        self.respawn(occupied)
+
+    def respawn(self, occupied):
+        """Place the food on a uniformly random free cell.
+
+        `occupied` is either a Snake, whose grid already indexes the free
+        cells, or a plain iterable of cell indices. When no cell is free the
+        cell becomes None.
+        """
+        if isinstance(occupied, Snake):
+            grid = occupied.grid
+        else:
+            grid = Grid(self.cols, self.rows)
+            for cell in occupied:
+                grid.occupy(cell)
+        self.cell = grid.random_free(self.rng)
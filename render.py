@@ -0,0 +1,409 @@
+"""Renderers for the PLAYING screen.
+
+A renderer draws a Simulation onto the screen and returns the list of rects
+it touched, or None when the whole surface changed and should be presented
+with pygame.display.flip(). GameManager picks one by name (see RENDERER in
+constants.py).
+"""
+from collections import namedtuple
+import pygame
+import constants
+from fonts import render_text
+from constants import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    GAME_WIDTH,
+    GAME_HEIGHT,
+    BORDER_SIZE,
+    CELL_SIZE,
+)
+
+OUTLINE_COLOR = (0, 0, 0)
+
+# Theme colors looked up once per theme instead of once per draw call
+ThemeColors = namedtuple('ThemeColors', 'background text snake head food border')
+
+
+def resolve_theme(theme):
+    """Return the ThemeColors for a theme dict, filling in the defaults."""
+    return ThemeColors(
+        background=theme.get('background_color', (0, 0, 0)),
+        text=theme.get('text_color', (255, 255, 255)),
+        snake=theme.get('snake_color', (0, 255, 0)),
+        head=theme.get('head_color', theme.get('snake_color', (0, 255, 0))),
+        food=theme.get('food_color', (255, 0, 0)),
+        border=theme.get('border_color', (255, 255, 255)),
+    )
+
+
+def board_origin(width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+    """Return the position of the top-left corner of the border in a
+    `width` x `height` window."""
+    # read through the module so toggling CENTER_GAME_AREA at runtime works
+    if constants.CENTER_GAME_AREA:
+        area_x = (width - (GAME_WIDTH + 2 * BORDER_SIZE)) // 2
+        area_y = (height - (GAME_HEIGHT + 2 * BORDER_SIZE)) // 2
+        return area_x, area_y
+    return 0, 0
+
+
+class FullRenderer:
+    """Redraws the whole screen every frame.
+
+    The background and border never change during a game, so they are kept
+    pre-rendered in `static_layer` (a Surface in the screen's pixel format)
+    and blitted in one call. The layer, the board position and the resolved
+    theme colors are rebuilt only when the screen size, CENTER_GAME_AREA or
+    the theme changes.
+    """
+
+    def __init__(self):
+        self._score_rect = None
+        self._theme = None
+        self._layout_key = None
+        self.colors = None
+        self.static_layer = None
+        self.area = (0, 0)
+        self.origin = (BORDER_SIZE, BORDER_SIZE)
+
+    def invalidate(self):
+        """Force the next draw() to repaint everything (no-op here)."""
+
+    def _prepare(self, screen, theme):
+        """Refresh the cached colors, layout and static layer if anything
+        they depend on changed; return True when they were rebuilt."""
+        if theme != self._theme:
+            self._theme = dict(theme)
+            self.colors = resolve_theme(theme)
+            self._layout_key = None
+        size = screen.get_size()
+        key = (size, constants.CENTER_GAME_AREA)
+        if key == self._layout_key:
+            return False
+        self._layout_key = key
+        area_x, area_y = self.area = board_origin(*size)
+        self.origin = (area_x + BORDER_SIZE, area_y + BORDER_SIZE)
+        # passing the screen gives the layer its pixel format, so blits are plain copies
+        layer = pygame.Surface(size, 0, screen)
+        layer.fill(self.colors.background)
+        self._draw_border(layer, area_x, area_y)
+        self.static_layer = layer
+        return True
+
+    def _draw_border(self, screen, area_x, area_y):
+        border_color = self.colors.border
+        # top
+        top_rect = (area_x, area_y, GAME_WIDTH + 2 * BORDER_SIZE, BORDER_SIZE)
+        pygame.draw.rect(screen, border_color, top_rect)
+        # bottom
+        bottom_rect = (area_x, area_y + GAME_HEIGHT + BORDER_SIZE, GAME_WIDTH + 2 * BORDER_SIZE, BORDER_SIZE)
+        pygame.draw.rect(screen, border_color, bottom_rect)
+        # left
+        left_rect = (area_x, area_y, BORDER_SIZE, GAME_HEIGHT + 2 * BORDER_SIZE)
+        pygame.draw.rect(screen, border_color, left_rect)
+        # right
+        right_rect = (area_x + GAME_WIDTH + BORDER_SIZE, area_y, BORDER_SIZE, GAME_HEIGHT + 2 * BORDER_SIZE)
+        pygame.draw.rect(screen, border_color, right_rect)
+
+    def _draw_score(self, screen, sim):
+        origin_x, origin_y = self.origin
+        score_surf = render_text(f"Score: {sim.score}", 36, self.colors.text)
+        return screen.blit(score_surf, (origin_x + 10, origin_y + 10))
+
+    def draw(self, screen, sim, theme):
+        self._prepare(screen, theme)
+        origin_x, origin_y = self.origin
+        cols = sim.cols
+
+        screen.blit(self.static_layer, (0, 0))
+
+        # draw food (cells are converted to pixels only here)
+        if sim.food_cell is not None:
+            frow, fcol = divmod(sim.food_cell, cols)
+            food_rect = (origin_x + fcol * CELL_SIZE, origin_y + frow * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+            pygame.draw.rect(screen, self.colors.food, food_rect)
+            pygame.draw.rect(screen, OUTLINE_COLOR, food_rect, 1)
+
+        # draw snake
+        snake_color = self.colors.snake
+        for cell in sim.body:
+            row, col = divmod(cell, cols)
+            seg_rect = (origin_x + col * CELL_SIZE, origin_y + row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+            pygame.draw.rect(screen, snake_color, seg_rect)
+            pygame.draw.rect(screen, OUTLINE_COLOR, seg_rect, 1)
+
+        self._score_rect = self._draw_score(screen, sim)
+        return None
+
+
+class DirtyRectRenderer(FullRenderer):
+    """Repaints only the cells the simulation reports as changed, plus the
+    score, and returns their rects for pygame.display.update().
+
+    Falls back to a full redraw for a new game, after set_state(), when
+    the static layer is rebuilt (screen size, layout or theme change) and
+    when invalidate() is called (e.g. after another state drew over the
+    screen).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._sim = None
+        self._stale = True
+        self._score = None
+
+    def invalidate(self):
+        self._stale = True
+
+    def _paint_cell(self, screen, sim, cell, origin_x, origin_y):
+        row, col = divmod(cell, sim.cols)
+        rect = pygame.Rect(origin_x + col * CELL_SIZE, origin_y + row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+        if not sim.is_free(cell):
+            color = self.colors.snake
+        elif cell == sim.food_cell:
+            color = self.colors.food
+        else:
+            screen.fill(self.colors.background, rect)
+            return rect
+        pygame.draw.rect(screen, color, rect)
+        pygame.draw.rect(screen, OUTLINE_COLOR, rect, 1)
+        return rect
+
+    def _cells_under(self, sim, rect, origin_x, origin_y):
+        """Yield the cells overlapping a pixel rect."""
+        first_col = max(0, (rect.left - origin_x) // CELL_SIZE)
+        last_col = min(sim.cols - 1, (rect.right - 1 - origin_x) // CELL_SIZE)
+        first_row = max(0, (rect.top - origin_y) // CELL_SIZE)
+        last_row = min(sim.rows - 1, (rect.bottom - 1 - origin_y) // CELL_SIZE)
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                yield row * sim.cols + col
+
+    def draw(self, screen, sim, theme):
+        rebuilt = self._prepare(screen, theme)
+        if rebuilt or self._stale or sim is not self._sim or sim.changes is None:
+            self._sim = sim
+            self._stale = False
+            self._score = sim.score
+            super().draw(screen, sim, theme)
+            sim.changes = []
+            return None
+
+        origin_x, origin_y = self.origin
+        changed = sim.changes
+        sim.changes = []
+        rects = [self._paint_cell(screen, sim, cell, origin_x, origin_y) for cell in changed]
+
+        # the score is drawn over the board: repaint it when it changes or
+        # when a repainted cell overlapped it
+        score_rect = self._score_rect
+        if sim.score != self._score or score_rect.collidelist(rects) != -1:
+            self._score = sim.score
+            screen.fill(self.colors.background, score_rect)
+            for cell in self._cells_under(sim, score_rect, origin_x, origin_y):
+                self._paint_cell(screen, sim, cell, origin_x, origin_y)
+            self._score_rect = self._draw_score(screen, sim)
+            rects.append(score_rect.union(self._score_rect))
+        return rects
+
+
+class AtlasRenderer(FullRenderer):
+    """Full redraw that blits pre-rendered cell tiles instead of drawing
+    two rects per cell.
+
+    The body, head and food tiles (fill plus outline) are rendered once per
+    theme into one atlas Surface, and the whole snake goes to the screen as
+    a single Surface.blits() batch.
+    """
+
+    BODY, HEAD, FOOD = range(3)
+
+    def __init__(self):
+        super().__init__()
+        self.atlas = None
+        self._tiles = None
+        self._positions = None
+        self._positions_key = None
+
+    def _prepare(self, screen, theme):
+        rebuilt = super()._prepare(screen, theme)
+        if rebuilt:
+            colors = self.colors
+            self.atlas = pygame.Surface((3 * CELL_SIZE, CELL_SIZE), 0, screen)
+            if self.atlas.get_pitch() % 16 == 0:
+                # SDL copies between 16-byte aligned rows with non-temporal
+                # SSE stores, which is many times slower for tiles this
+                # small; a spare column keeps the atlas off that path
+                self.atlas = pygame.Surface((3 * CELL_SIZE + 1, CELL_SIZE), 0, screen)
+            self._tiles = []
+            for i, color in enumerate((colors.snake, colors.head, colors.food)):
+                tile = pygame.Rect(i * CELL_SIZE, 0, CELL_SIZE, CELL_SIZE)
+                pygame.draw.rect(self.atlas, color, tile)
+                pygame.draw.rect(self.atlas, OUTLINE_COLOR, tile, 1)
+                self._tiles.append(tile)
+        return rebuilt
+
+    def _cell_positions(self, sim):
+        """Window position of every cell, indexed by cell number."""
+        key = (sim.cols, sim.rows, self.origin)
+        if key != self._positions_key:
+            origin_x, origin_y = self.origin
+            self._positions = [(origin_x + col * CELL_SIZE, origin_y + row * CELL_SIZE)
+                               for row in range(sim.rows) for col in range(sim.cols)]
+            self._positions_key = key
+        return self._positions
+
+    def draw(self, screen, sim, theme):
+        self._prepare(screen, theme)
+        positions = self._cell_positions(sim)
+        atlas = self.atlas
+        body_tile, head_tile, food_tile = self._tiles
+
+        screen.blit(self.static_layer, (0, 0))
+        if sim.food_cell is not None:
+            screen.blit(atlas, positions[sim.food_cell], food_tile)
+        body = sim.body
+        if len(body):
+            screen.blits([(atlas, positions[cell], body_tile) for cell in body], False)
+            screen.blit(atlas, positions[sim.head], head_tile)
+
+        self._score_rect = self._draw_score(screen, sim)
+        return None
+
+
+class SurfarrayRenderer(FullRenderer):
+    """Full redraw whose cost depends on the board size only.
+
+    Builds an image with one pixel per cell straight from the simulation's
+    occupancy counts with NumPy, then scales it onto the play area with a
+    single pygame.transform.scale(). Boards larger than GRID_COLS x
+    GRID_ROWS shrink their cells to fit the play area. Cells are drawn
+    without outlines. Requires NumPy.
+    """
+
+    # palette indices
+    EMPTY, BODY, FOOD, HEAD = range(4)
+
+    def __init__(self):
+        super().__init__()
+        import numpy
+        self._np = numpy
+        self._palette = None
+        self._index = None
+        self._cells = None
+        self._board = None
+        self._board_key = None
+
+    def _prepare(self, screen, theme):
+        rebuilt = super()._prepare(screen, theme)
+        if rebuilt:
+            colors = self.colors
+            self._palette = self._np.array(
+                [colors.background, colors.snake, colors.food, colors.head], dtype=self._np.uint8)
+        return rebuilt
+
+    def _prepare_board(self, screen, sim):
+        key = (screen, sim.cols, sim.rows, self.origin)
+        if key == self._board_key:
+            return
+        cols, rows = sim.cols, sim.rows
+        cell = max(1, min(CELL_SIZE, GAME_WIDTH // cols, GAME_HEIGHT // rows))
+        origin_x, origin_y = self.origin
+        self._cells = pygame.Surface((cols, rows), 0, screen)
+        # scale() writes straight into the play area of the screen
+        self._board = screen.subsurface((origin_x, origin_y, cols * cell, rows * cell))
+        self._index = self._np.zeros(cols * rows, dtype=self._np.uint8)
+        self._board_key = key
+
+    def draw(self, screen, sim, theme):
+        np = self._np
+        self._prepare(screen, theme)
+        self._prepare_board(screen, sim)
+
+        index = self._index
+        np.minimum(np.frombuffer(sim.occupancy, dtype=np.uint8), self.BODY, out=index)
+        if sim.food_cell is not None:
+            index[sim.food_cell] = self.FOOD
+        if len(sim.body):
+            index[sim.head] = self.HEAD
+        # surfarray indexes pixels [x, y]: transpose the row-major board
+        rgb = self._palette[index.reshape(sim.rows, sim.cols).T]
+
+        screen.blit(self.static_layer, (0, 0))
+        pygame.surfarray.blit_array(self._cells, rgb)
+        pygame.transform.scale(self._cells, self._board.get_size(), self._board)
+        self._score_rect = self._draw_score(screen, sim)
+        return None
+
+
+# Text lines of the overlay screens, as OverlayCache.frame() takes them
+PAUSED_LINES = (("PAUSED", 72, 0),)
+
+
+def game_over_lines(score):
+    return (("GAME OVER", 72, -40), (f"Final Score: {score}", 48, 40))
+
+
+class OverlayCache:
+    """Pre-composed frames for the screens drawn over a frozen board
+    (pause, game over).
+
+    Each frame is built once from a snapshot of the board (drawn by a
+    private FullRenderer), a translucent dimming layer and the overlay's
+    text lines, then re-blitted unchanged for as long as nothing it shows
+    changes: the game, its tick, the screen size, the theme or the text.
+    """
+
+    DIM_COLOR = (0, 0, 0, 150)
+
+    def __init__(self):
+        self._board = FullRenderer()
+        self._frames = {}
+
+    def clear(self):
+        self._frames.clear()
+
+    def frame(self, name, screen, sim, theme, lines):
+        """Return the frame for overlay `name`. `lines` is a sequence of
+        (text, font size, vertical offset from the board centre)."""
+        lines = tuple(lines)
+        key = (screen.get_size(), tuple(sorted(theme.items())), lines,
+               sim, sim.ticks if sim is not None else None)
+        cached = self._frames.get(name)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        frame = pygame.Surface(screen.get_size(), 0, screen)
+        if sim is not None:
+            self._board.draw(frame, sim, theme)
+        else:
+            frame.fill(resolve_theme(theme).background)
+        area_x, area_y = board_origin(*screen.get_size())
+        dim = pygame.Surface((GAME_WIDTH, GAME_HEIGHT), pygame.SRCALPHA)
+        dim.fill(self.DIM_COLOR)
+        frame.blit(dim, (area_x + BORDER_SIZE, area_y + BORDER_SIZE))
+
+        text_color = resolve_theme(theme).text
+        center_x = area_x + BORDER_SIZE + GAME_WIDTH // 2
+        center_y = area_y + BORDER_SIZE + GAME_HEIGHT // 2
+        for text, size, offset in lines:
+            surf = render_text(text, size, text_color)
+            frame.blit(surf, surf.get_rect(center=(center_x, center_y + offset)))
+        self._frames[name] = (key, frame)
+        return frame
+
+
+RENDERERS = {
+    'full': FullRenderer,
+    'dirty': DirtyRectRenderer,
+    'atlas': AtlasRenderer,
+    'surfarray': SurfarrayRenderer,
+}
+
+
+def make_renderer(name):
+    """Build the renderer registered under `name` (see RENDERERS)."""
+    try:
+        return RENDERERS[name]()
+    except KeyError:
+        raise ValueError(f"unknown renderer {name!r}; choose from {', '.join(RENDERERS)}") from None
@@ -0,0 +1,369 @@
+"""Compact binary recordings of games, exact headless replay and seeking.
+
+A game is fully determined by its seed, board setup and the direction the
+snake faced on each tick, so a recording stores only the ticks where the
+direction changed, plus periodic keyframes so playback can seek without
+re-simulating from tick zero:
+
+    header    b'SNKR', version byte, then varints: seed, cols, rows,
+              initial length, tick_ms, keyframe interval (version 2+)
+    turn      varint ticks since the previous entry, direction code byte
+    keyframe  varint ticks since the previous entry, KEYFRAME byte,
+              varint payload size, payload (see encode_keyframe)
+    end       varint ticks since the previous entry, END byte
+
+Varints are unsigned LEB128, so a turn usually costs two bytes.
+
+    python replay.py game.snkr [--realtime] [--seek TICK]
+"""
+import argparse
+import bisect
+import struct
+import time
+from array import array
+from constants import DIRECTIONS
+from engine import Simulation
+
+MAGIC = b'SNKR'
+VERSION = 3
+SUPPORTED_VERSIONS = (1, 2, 3)
+
+# Default ticks between keyframes; 0 disables them
+KEYFRAME_INTERVAL = 10000
+
+# direction codes stored in the turn log and keyframes
+DIRECTION_CODES = {
+    DIRECTIONS['UP']: 0,
+    DIRECTIONS['DOWN']: 1,
+    DIRECTIONS['LEFT']: 2,
+    DIRECTIONS['RIGHT']: 3,
+}
+CODE_DIRECTIONS = {code: d for d, code in DIRECTION_CODES.items()}
+KEYFRAME = 0xFE
+END = 0xFF
+
+
+class ReplayError(ValueError):
+    """Raised for malformed or unsupported recordings."""
+
+
+def write_varint(out, value):
+    """Append `value` (a non-negative int) to bytearray `out` as LEB128."""
+    if value < 0:
+        raise ValueError('varints must be non-negative')
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos):
+    """Decode a LEB128 varint at `pos`; return (value, next position)."""
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ReplayError('truncated varint')
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_state(state, cols):
+    """Serialize a Simulation.get_state() tuple.
+
+    The body is stored as its head cell plus one 2-bit step code per
+    following segment, and the Mersenne Twister state as 625 uint32 words.
+    """
+    ticks, score, over, direction, grow_flag, food_cell, cells, rng_state = state
+    out = bytearray()
+    for value in (ticks, score, int(over), int(grow_flag), DIRECTION_CODES[direction],
+                  0 if food_cell is None else food_cell + 1, len(cells), cells[0] if cells else 0):
+        write_varint(out, value)
+    step_codes = {-cols: 0, cols: 1, 1: 2, -1: 3}
+    packed = bytearray((len(cells) + 2) // 4)
+    for i in range(1, len(cells)):
+        packed[(i - 1) >> 2] |= step_codes[cells[i] - cells[i - 1]] << (((i - 1) & 3) * 2)
+    out += packed
+    version, internal, gauss_next = rng_state
+    write_varint(out, version)
+    out += array('I', internal).tobytes()
+    if gauss_next is None:
+        out.append(0)
+    else:
+        out.append(1)
+        out += struct.pack('<d', gauss_next)
+    return bytes(out)
+
+
+def decode_state(data, cols):
+    """Inverse of encode_state()."""
+    return _decode_state(data, cols)[0]
+
+
+def _decode_state(data, cols, pos=0):
+    """decode_state() of the bytes at `pos`; returns (state, next position)."""
+    values = []
+    for _ in range(8):
+        value, pos = read_varint(data, pos)
+        values.append(value)
+    ticks, score, over, grow_flag, direction_code, food, length, head = values
+    steps = (-cols, cols, 1, -1)
+    packed_size = (length + 2) // 4
+    packed = data[pos:pos + packed_size]
+    pos += packed_size
+    cells = [head] if length else []
+    for i in range(1, length):
+        code = (packed[(i - 1) >> 2] >> (((i - 1) & 3) * 2)) & 3
+        cells.append(cells[-1] + steps[code])
+    version, pos = read_varint(data, pos)
+    internal = array('I')
+    internal.frombytes(data[pos:pos + 625 * 4])
+    pos += 625 * 4
+    if data[pos]:
+        gauss_next = struct.unpack_from('<d', data, pos + 1)[0]
+        pos += 9
+    else:
+        gauss_next = None
+        pos += 1
+    return (ticks, score, bool(over), CODE_DIRECTIONS[direction_code], bool(grow_flag),
+            food - 1 if food else None, cells, (version, tuple(internal), gauss_next)), pos
+
+
+def encode_keyframe(sim):
+    """Serialize `sim` exactly: encode_state() of its state, then the order
+    of its free-cell index (a varint count and one varint per cell), which
+    food placement draws from but the state tuple leaves out."""
+    grid = sim.snake.grid
+    out = bytearray(encode_state(sim.get_state(), sim.cols))
+    write_varint(out, grid.free_count)
+    for cell in grid.free[:grid.free_count]:
+        write_varint(out, cell)
+    return bytes(out)
+
+
+def restore_keyframe(sim, data, with_free_order=True):
+    """Put `sim` back into the state encode_keyframe() saved in `data`.
+    Version 2 keyframes hold the state alone (`with_free_order` False)."""
+    state, pos = _decode_state(data, sim.cols)
+    sim.set_state(state)
+    if with_free_order:
+        count, pos = read_varint(data, pos)
+        free = []
+        for _ in range(count):
+            cell, pos = read_varint(data, pos)
+            free.append(cell)
+        try:
+            sim.snake.grid.set_free_order(free)
+        except ValueError:
+            raise ReplayError('keyframe free cells do not match its body') from None
+
+
+class Recorder:
+    """Records a Simulation's turns (and keyframes) from its first tick.
+
+    Attach it before the first step and call finish() once the game is over
+    to close the log. A keyframe is written every `keyframe_interval` ticks;
+    larger intervals give smaller files but slower seeks.
+
+    Keyframes are read-only snapshots that include the free-cell index
+    order, so seeking to one continues exactly like the recorded game and
+    recording never changes the game being recorded.
+    """
+
+    def __init__(self, sim, keyframe_interval=KEYFRAME_INTERVAL):
+        if sim.ticks or sim.seed is None:
+            raise ValueError('recording needs a seeded Simulation that has not stepped yet')
+        self.sim = sim
+        self.keyframe_interval = keyframe_interval
+        self.data = bytearray(MAGIC)
+        self.data.append(VERSION)
+        for value in (sim.seed, sim.cols, sim.rows, sim.initial_length, sim.tick_ms,
+                      keyframe_interval):
+            write_varint(self.data, value)
+        self._direction = sim.snake.direction
+        self._last_entry_tick = 0
+        self.finished = False
+        sim.recorder = self
+
+    def on_tick(self, sim):
+        direction = sim.snake.direction
+        if direction != self._direction:
+            write_varint(self.data, sim.ticks - self._last_entry_tick)
+            self.data.append(DIRECTION_CODES[direction])
+            self._direction = direction
+            self._last_entry_tick = sim.ticks
+        if self.keyframe_interval and sim.ticks and not sim.ticks % self.keyframe_interval:
+            payload = encode_keyframe(sim)
+            write_varint(self.data, sim.ticks - self._last_entry_tick)
+            self.data.append(KEYFRAME)
+            write_varint(self.data, len(payload))
+            self.data += payload
+            self._last_entry_tick = sim.ticks
+
+    def finish(self):
+        """Write the end marker and detach from the simulation."""
+        if not self.finished:
+            write_varint(self.data, self.sim.ticks - self._last_entry_tick)
+            self.data.append(END)
+            self.finished = True
+            if self.sim.recorder is self:
+                self.sim.recorder = None
+        return bytes(self.data)
+
+
+class Recording:
+    """A parsed recording: the Simulation setup, its turn log and an index
+    of keyframes (decoded lazily on seek)."""
+
+    def __init__(self, seed, cols, rows, initial_length, tick_ms, turns, total_ticks,
+                 keyframe_interval=0, keyframes=None, data=b'', version=VERSION):
+        self.seed = seed
+        self.cols = cols
+        self.rows = rows
+        self.initial_length = initial_length
+        self.tick_ms = tick_ms
+        # {tick index: direction} for every tick that starts with a turn
+        self.turns = turns
+        self.total_ticks = total_ticks
+        self.keyframe_interval = keyframe_interval
+        # sorted [(tick, payload offset, payload size)] into `data`
+        self.keyframes = keyframes or []
+        self._keyframe_ticks = [tick for tick, _, _ in self.keyframes]
+        self._keyframe_index = {tick: i for i, tick in enumerate(self._keyframe_ticks)}
+        self.data = data
+        self.version = version
+
+    @classmethod
+    def from_bytes(cls, data):
+        if data[:4] != MAGIC:
+            raise ReplayError('not a snake recording')
+        if len(data) < 5 or data[4] not in SUPPORTED_VERSIONS:
+            raise ReplayError('unsupported recording version')
+        version = data[4]
+        pos = 5
+        header = []
+        for _ in range(5 if version == 1 else 6):
+            value, pos = read_varint(data, pos)
+            header.append(value)
+        turns = {}
+        keyframes = []
+        tick = 0
+        while True:
+            delta, pos = read_varint(data, pos)
+            if pos >= len(data):
+                raise ReplayError('truncated turn log')
+            code = data[pos]
+            pos += 1
+            tick += delta
+            if code == END:
+                break
+            if code == KEYFRAME:
+                size, pos = read_varint(data, pos)
+                if pos + size > len(data):
+                    raise ReplayError('truncated keyframe')
+                keyframes.append((tick, pos, size))
+                pos += size
+                continue
+            if code not in CODE_DIRECTIONS:
+                raise ReplayError(f'bad direction code {code}')
+            turns[tick] = CODE_DIRECTIONS[code]
+        return cls(*header[:5], turns=turns, total_ticks=tick,
+                   keyframe_interval=header[5] if version > 1 else 0,
+                   keyframes=keyframes, data=bytes(data), version=version)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def new_simulation(self, clock=None):
+        """Build the Simulation this recording starts from."""
+        kwargs = {'clock': clock} if clock is not None else {}
+        return Simulation(self.cols, self.rows, self.initial_length,
+                          seed=self.seed, tick_ms=self.tick_ms, **kwargs)
+
+    def _restore_keyframe(self, sim, i):
+        _, offset, size = self.keyframes[i]
+        restore_keyframe(sim, self.data[offset:offset + size], with_free_order=self.version > 2)
+
+    def sync(self, sim):
+        """Restore the keyframe for the tick `sim` is about to play, if any,
+        mirroring the resync a version 2 Recorder did at that tick. Later
+        keyframes are exact snapshots, so playing through them needs none."""
+        if self.version != 2:
+            return
+        i = self._keyframe_index.get(sim.ticks)
+        if i is not None and not sim.over:
+            self._restore_keyframe(sim, i)
+
+    def steer(self, sim):
+        """Resync and apply the recorded turn for the tick `sim` is about to
+        play.
+
+        Lets a clock-driven presenter (GameManager) replay at real speed.
+        """
+        self.sync(sim)
+        direction = self.turns.get(sim.ticks)
+        if direction is not None:
+            sim.change_direction(direction)
+
+    def seek(self, tick, clock=None):
+        """Return a Simulation positioned after `tick` ticks, restored from
+        the nearest keyframe at or before `tick` and simulated forward."""
+        tick = max(0, min(tick, self.total_ticks))
+        sim = self.new_simulation(clock)
+        i = bisect.bisect_right(self._keyframe_ticks, tick) - 1
+        if i >= 0:
+            self._restore_keyframe(sim, i)
+        turns = self.turns
+        for t in range(sim.ticks, tick):
+            sim.step(turns.get(t))
+        return sim
+
+    def play(self, realtime=False, on_step=None, start=0):
+        """Re-simulate the game from tick `start` (seeking there first) to
+        the end and return the final Simulation.
+
+        With `realtime` each tick waits `tick_ms`, otherwise the game runs
+        as fast as the CPU allows. `on_step(sim, events)` is called after
+        every tick.
+        """
+        sim = self.seek(start) if start else self.new_simulation()
+        turns = self.turns
+        delay = self.tick_ms / 1000.0
+        next_time = time.perf_counter()
+        for tick in range(sim.ticks, self.total_ticks):
+            if realtime:
+                next_time += delay
+                pause = next_time - time.perf_counter()
+                if pause > 0:
+                    time.sleep(pause)
+            if tick in self._keyframe_index:
+                self.sync(sim)
+            events = sim.step(turns.get(tick))
+            if on_step is not None:
+                on_step(sim, events)
+        return sim
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay a recorded snake game headlessly.')
+    parser.add_argument('path', help='recording file')
+    parser.add_argument('--realtime', action='store_true', help='play at the recorded tick rate')
+    parser.add_argument('--seek', type=int, default=0, help='start playback at this tick')
+    args = parser.parse_args(argv)
+
+    recording = Recording.load(args.path)
+    start = time.perf_counter()
+    sim = recording.play(realtime=args.realtime, start=args.seek)
+    elapsed = time.perf_counter() - start
+    print(f"[replay] seed={recording.seed} ticks={sim.ticks} score={sim.score} "
+          f"over={sim.over} in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
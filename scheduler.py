@@ -0,0 +1,48 @@
+"""Frame pacing for the main loop and the menus.
+
+While something animates (gameplay) a loop polls for input and sleeps to
+the frame rate as before. Otherwise there is nothing to draw until the
+player does something, so the loop blocks in pygame.event.wait() and the
+process sleeps until input arrives, a pygame timer fires
+(pygame.time.set_timer posts an event) or IDLE_TIMEOUT_MS passes, which
+bounds how long quit flags and state changes made elsewhere go unnoticed.
+"""
+import pygame
+from constants import FPS, IDLE_TIMEOUT_MS
+
+
+class IdleScheduler:
+    """Hands each loop iteration its batch of events.
+
+    `event_filter`, if given, receives each batch and returns the events to
+    hand out (GameManager uses it to map mouse positions). `wakeups` counts
+    the iterations that returned (polled frames plus idle wakeups, whether
+    or not any events came) and is what the idle benchmark reports per
+    second.
+    """
+
+    def __init__(self, clock=None, fps=FPS, idle_timeout_ms=IDLE_TIMEOUT_MS, event_filter=None):
+        self.clock = clock or pygame.time.Clock()
+        self.fps = fps
+        self.idle_timeout_ms = idle_timeout_ms
+        self.event_filter = event_filter
+        self.wakeups = 0
+
+    def wait(self, animating=False):
+        """Return the pending events: after pacing to `fps` when
+        `animating`, otherwise after blocking until at least one event
+        arrives or the idle timeout passes (possibly returning none)."""
+        self.wakeups += 1
+        if animating:
+            self.clock.tick(self.fps)
+            events = pygame.event.get()
+        else:
+            event = pygame.event.wait(self.idle_timeout_ms)
+            # restart frame timing so the first animated frame is not a catch-up
+            self.clock.tick()
+            if event.type == pygame.NOEVENT:
+                return []
+            events = [event] + pygame.event.get()
+        if self.event_filter is not None:
+            events = self.event_filter(events)
+        return events
@@ -0,0 +1,188 @@
+"""Content-addressed on-disk cache of synthesized sound buffers.
+
+An entry is named by the SHA-256 of everything that determines its bytes
+(the synthesis parameters, the generator version and the mixer format; see
+key()), so changing any of them simply looks up a different entry and a
+stale buffer can never be reused. Entries and the index are written to a
+temporary file in the cache directory and moved into place with
+os.replace(), so an interrupted write never leaves a partial file behind.
+
+The index (index.json) records each entry's size and last use. Once the
+entries add up to more than `max_bytes` the least recently used are
+deleted. Last-use times of hits are only saved along with the next change
+to the index, so a launch where every lookup hits writes nothing.
+Everything is best-effort: on a read-only or missing directory, or with
+entries the index cannot vouch for, the cache misses and callers
+synthesize as usual.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+# Cache directory, next to the shipped assets
+SFX_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'assets', 'cache', 'sfx')
+# Total entry bytes kept before the least recently used are evicted
+SFX_CACHE_MAX_BYTES = 4 * 1024 * 1024
+
+INDEX_NAME = 'index.json'
+_HEX_DIGITS = frozenset('0123456789abcdef')
+
+
+def key(**params):
+    """Hex digest identifying the buffer built from `params` (any
+    JSON-serializable values)."""
+    blob = json.dumps(params, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+def _valid_entry(entry_key, entry):
+    """Whether an index entry looks like one put() wrote: a key() digest
+    with a non-negative size and a last-use time."""
+    return (len(entry_key) == 64 and _HEX_DIGITS.issuperset(entry_key)
+            and isinstance(entry, dict)
+            and isinstance(entry.get('size'), int) and entry['size'] >= 0
+            and isinstance(entry.get('used'), (int, float)))
+
+
+def _atomic_write(directory, name, data):
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, os.path.join(directory, name))
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SfxCache:
+    """Buffers stored as `directory`/<key>.pcm, at most `max_bytes` in all."""
+
+    def __init__(self, directory=SFX_CACHE_DIR, max_bytes=SFX_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._index = None
+        self._dirty = False
+
+    def _path(self, entry_key):
+        return os.path.join(self.directory, entry_key + '.pcm')
+
+    def _load_index(self):
+        if self._index is not None:
+            return self._index
+        try:
+            with open(os.path.join(self.directory, INDEX_NAME)) as f:
+                index = json.load(f)
+            if not isinstance(index, dict):
+                raise ValueError('bad index')
+            valid = {entry_key: entry for entry_key, entry in index.items()
+                     if _valid_entry(entry_key, entry)}
+            if len(valid) != len(index):
+                # drop what the index cannot vouch for; those entries miss
+                index = valid
+                self._dirty = True
+        except (OSError, ValueError):
+            # missing or damaged: rebuild from the entries on disk
+            index = {}
+            try:
+                names = os.listdir(self.directory)
+            except OSError:
+                names = []
+            for name in names:
+                if name.endswith('.pcm'):
+                    try:
+                        stat = os.stat(os.path.join(self.directory, name))
+                    except OSError:
+                        continue
+                    index[name[:-4]] = {'size': stat.st_size, 'used': stat.st_mtime}
+        self._index = index
+        return index
+
+    def get(self, entry_key):
+        """Return the cached bytes for `entry_key`, or None."""
+        index = self._load_index()
+        entry = index.get(entry_key)
+        data = None
+        if entry is not None:
+            try:
+                with open(self._path(entry_key), 'rb') as f:
+                    data = f.read()
+            except OSError:
+                data = None
+            if data is None or len(data) != entry.get('size'):
+                # vanished or overwritten outside the cache: forget it
+                index.pop(entry_key, None)
+                self._dirty = True
+                data = None
+        if data is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        # saved with the next change to the index, not on its own
+        entry['used'] = time.time()
+        return data
+
+    def put(self, entry_key, data):
+        """Store `data` under `entry_key`, evict down to `max_bytes` and save
+        the index. Returns False if the cache could not be written."""
+        index = self._load_index()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            _atomic_write(self.directory, entry_key + '.pcm', data)
+        except OSError:
+            return False
+        index[entry_key] = {'size': len(data), 'used': time.time()}
+        self._evict(keep=entry_key)
+        self._dirty = True
+        return self.flush()
+
+    def _evict(self, keep=None):
+        index = self._index
+        total = sum(entry['size'] for entry in index.values())
+        for entry_key in sorted(index, key=lambda k: index[k]['used']):
+            if total <= self.max_bytes:
+                break
+            if entry_key == keep:
+                continue
+            try:
+                os.remove(self._path(entry_key))
+            except OSError:
+                pass
+            total -= index.pop(entry_key)['size']
+
+    def flush(self):
+        """Save the index if it changed (an entry was added, evicted or
+        found stale)."""
+        if not self._dirty:
+            return True
+        try:
+            _atomic_write(self.directory, INDEX_NAME,
+                          json.dumps(self._index, sort_keys=True).encode('utf-8'))
+        except OSError:
+            return False
+        self._dirty = False
+        return True
+
+    def clear(self):
+        """Delete every entry and the index."""
+        for entry_key in list(self._load_index()):
+            try:
+                os.remove(self._path(entry_key))
+            except OSError:
+                pass
+        try:
+            os.remove(os.path.join(self.directory, INDEX_NAME))
+        except OSError:
+            pass
+        self._index = {}
+        self._dirty = False
+
+
+sfx_cache = SfxCache()
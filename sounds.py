@@ -1,8 +1,16 @@
 import os
+import sys
 import math
 import wave
-import struct
+from array import array
 import pygame
+from channels import ChannelPool, Category
+from sfx_cache import sfx_cache, key as cache_key
+
+try:
+    import numpy as np
+except ImportError:  # synthesis falls back to the array module
+    np = None
 
 # Simple sound manager for SFX and BGM. Keeps loaded sounds cached so repeated
 # requests reuse the same pygame.mixer.Sound instances.
@@ -14,71 +22,117 @@ _SFX_INITIALIZED = False
 BASE_ASSETS_DIR = os.path.join(os.path.dirname(__file__), 'assets')
 SFX_DIR = os.path.join(BASE_ASSETS_DIR, 'sfx')
 BGM_DIR = os.path.join(BASE_ASSETS_DIR, 'bgm')
-_BEEP_PATH = os.path.join(SFX_DIR, 'sfx_beep.wav')
 
+# Mixer channels reserved for each SFX category and the priority it plays at
+SFX_CATEGORIES = {
+    'pickup': Category(channels=3, priority=1),
+    'alert': Category(channels=1, priority=2),
+    'misc': Category(channels=2, priority=0),
+}
+# Category of each SFX; anything else plays as 'misc'
+SFX_CATEGORY = {'beep': 'pickup', 'low_beep': 'alert'}
 
-def _ensure_asset_dirs():
-    try:
-        os.makedirs(SFX_DIR, exist_ok=True)
-        os.makedirs(BGM_DIR, exist_ok=True)
-    except Exception:
-        # best-effort; creation may fail in restricted envs
-        pass
+# created together with the mixer; set_sfx_volume() sets its master volume
+_POOL = None
+_SFX_VOLUME = 1.0
 
 
 def _ensure_mixer():
+    global _POOL
     try:
         if not pygame.mixer.get_init():
             pygame.mixer.init()
+        if _POOL is None and pygame.mixer.get_init():
+            # reserve the SFX channels before any sound can start on them
+            _POOL = ChannelPool(SFX_CATEGORIES)
+            _POOL.set_volume(_SFX_VOLUME)
     except Exception:
         # best-effort, callers should tolerate None returns
         pass
 
 
-def _create_beep_wav(path, freq_hz=880, duration_ms=120, volume=0.5, sample_rate=44100):
-    """Create a mono 16-bit PCM WAV file at `path` containing a sine beep.
+# Bump whenever synthesis output changes so cached buffers are rebuilt
+SFX_GENERATOR_VERSION = 1
 
-    Applies a simple ADSR envelope to reduce harshness.
-    """
-    # default envelope params (ms)
-    attack_ms = 5
-    decay_ms = 30
-    sustain_level = 0.8
-    release_ms = 60
+# ADSR envelopes (attack ms, decay ms, sustain level, release ms)
+_BEEP_ENVELOPE = (5, 30, 0.8, 60)
+_CHORD_ENVELOPE = (8, 50, 0.75, 80)
 
-    n_samples = int(sample_rate * (duration_ms / 1000.0))
-    max_amp = 2 ** 15 - 1
+_MAX_AMP = 2 ** 15 - 1
 
-    def _env(i):
-        t_ms = (i / sample_rate) * 1000.0
+
+def _synthesize_numpy(freqs, duration_ms, volume, sample_rate, envelope):
+    """16-bit mono PCM bytes of the summed sines in `freqs` (normalized by
+    their count) shaped by `envelope`, computed as whole arrays."""
+    attack_ms, decay_ms, sustain_level, release_ms = envelope
+    n_samples = int(sample_rate * (duration_ms / 1000.0))
+    t = np.arange(n_samples) / sample_rate
+    t_ms = t * 1000.0
+    release_start_ms = max(0.0, duration_ms - release_ms)
+    env = np.select(
+        [t_ms < attack_ms,
+         t_ms - attack_ms < decay_ms,
+         t_ms >= release_start_ms],
+        [t_ms / attack_ms,
+         1.0 - (1.0 - sustain_level) * ((t_ms - attack_ms) / decay_ms),
+         sustain_level * np.maximum(0.0, 1.0 - (t_ms - release_start_ms) / release_ms)],
+        sustain_level)
+    signal = np.zeros(n_samples)
+    for f in freqs:
+        signal += np.sin(2 * math.pi * f * t)
+    signal = volume * env * (signal / len(freqs))
+    # astype truncates towards zero like int()
+    return (np.clip(signal, -1.0, 1.0) * _MAX_AMP).astype('<i2').tobytes()
+
+
+def _synthesize_array(freqs, duration_ms, volume, sample_rate, envelope):
+    """Pure-Python fallback of _synthesize_numpy, filling an array('h')."""
+    attack_ms, decay_ms, sustain_level, release_ms = envelope
+    n_samples = int(sample_rate * (duration_ms / 1000.0))
+    release_start_ms = max(0.0, duration_ms - release_ms)
+    omegas = [2 * math.pi * f for f in freqs]
+    scale = volume / len(omegas)
+    sin = math.sin
+    samples = array('h', bytes(2 * n_samples))
+    for i in range(n_samples):
+        t = i / sample_rate
+        t_ms = t * 1000.0
         if t_ms < attack_ms:
-            return (t_ms / attack_ms)
-        t_ms -= attack_ms
-        if t_ms < decay_ms:
-            # decay from 1.0 -> sustain_level
-            return 1.0 - (1.0 - sustain_level) * (t_ms / decay_ms)
-        # sustain until release region
-        release_start_ms = max(0.0, duration_ms - release_ms)
-        if (i / sample_rate) * 1000.0 >= release_start_ms:
-            # in release
-            rel_t = ((i / sample_rate) * 1000.0) - release_start_ms
-            return sustain_level * max(0.0, 1.0 - (rel_t / release_ms))
-        return sustain_level
+            env = t_ms / attack_ms
+        elif t_ms - attack_ms < decay_ms:
+            env = 1.0 - (1.0 - sustain_level) * ((t_ms - attack_ms) / decay_ms)
+        elif t_ms >= release_start_ms:
+            env = sustain_level * max(0.0, 1.0 - (t_ms - release_start_ms) / release_ms)
+        else:
+            env = sustain_level
+        sample = scale * env * sum(sin(w * t) for w in omegas)
+        samples[i] = int(max(-1.0, min(1.0, sample)) * _MAX_AMP)
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    return samples.tobytes()
+
+
+def _synthesize(freqs, duration_ms, volume, sample_rate, envelope):
+    if np is not None:
+        return _synthesize_numpy(freqs, duration_ms, volume, sample_rate, envelope)
+    return _synthesize_array(freqs, duration_ms, volume, sample_rate, envelope)
 
+
+def _write_wav(path, pcm, sample_rate):
     with wave.open(path, 'w') as wf:
         wf.setnchannels(1)
         wf.setsampwidth(2)  # 16-bit
         wf.setframerate(sample_rate)
+        wf.writeframes(pcm)
 
-        for i in range(n_samples):
-            sample_t = i / sample_rate
-            env = _env(i)
-            sample = volume * env * math.sin(2 * math.pi * freq_hz * sample_t)
-            val = int(max(-1.0, min(1.0, sample)) * max_amp)
-            data = struct.pack('<h', val)
-            wf.writeframesraw(data)
 
-        wf.writeframes(b'')
+def _create_beep_wav(path, freq_hz=880, duration_ms=120, volume=0.5, sample_rate=44100):
+    """Create a mono 16-bit PCM WAV file at `path` containing a sine beep.
+
+    Applies a simple ADSR envelope to reduce harshness.
+    """
+    _write_wav(path, _synthesize([freq_hz], duration_ms, volume, sample_rate, _BEEP_ENVELOPE),
+               sample_rate)
 
 
 def _create_chord_wav(path, freqs, duration_ms=120, volume=0.5, sample_rate=44100):
@@ -89,115 +143,148 @@ def _create_chord_wav(path, freqs, duration_ms=120, volume=0.5, sample_rate=4410
     freqs = list(freqs)
     if not freqs:
         return
-    n_samples = int(sample_rate * (duration_ms / 1000.0))
-    max_amp = 2 ** 15 - 1
-    n_notes = len(freqs)
-
-    # envelope params (ms)
-    attack_ms = 8
-    decay_ms = 50
-    sustain_level = 0.75
-    release_ms = 80
-
-    def _env(i):
-        t_ms = (i / sample_rate) * 1000.0
-        if t_ms < attack_ms:
-            return (t_ms / attack_ms)
-        t_ms -= attack_ms
-        if t_ms < decay_ms:
-            return 1.0 - (1.0 - sustain_level) * (t_ms / decay_ms)
-        release_start_ms = max(0.0, duration_ms - release_ms)
-        if (i / sample_rate) * 1000.0 >= release_start_ms:
-            rel_t = ((i / sample_rate) * 1000.0) - release_start_ms
-            return sustain_level * max(0.0, 1.0 - (rel_t / release_ms))
-        return sustain_level
-
-    with wave.open(path, 'w') as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-
-        for i in range(n_samples):
-            t = i / sample_rate
-            s = 0.0
-            for f in freqs:
-                s += math.sin(2 * math.pi * f * t)
-            # normalize by number of notes
-            sample_base = (s / n_notes)
-            env = _env(i)
-            sample = volume * env * sample_base
-            val = int(max(-1.0, min(1.0, sample)) * max_amp)
-            data = struct.pack('<h', val)
-            wf.writeframesraw(data)
-
-        wf.writeframes(b'')
-
-
-def init_sounds(load_beep=True, freq_hz=880, duration_ms=120, volume=0.5, sample_rate=44100):
+    _write_wav(path, _synthesize(freqs, duration_ms, volume, sample_rate, _CHORD_ENVELOPE),
+               sample_rate)
+
+
+def _pcm_for_mixer(pcm, size, channels):
+    """Convert 16-bit little-endian mono `pcm` to the mixer's sample format
+    (`size` as pygame.mixer.get_init() reports it: 8/16/32 bits, negative
+    for signed, 32 meaning float) with the sample repeated on every channel."""
+    if np is not None:
+        samples = np.frombuffer(pcm, dtype='<i2').astype(np.int32)
+        if size == -16:
+            out = samples.astype(np.int16)
+        elif size == 16:
+            out = (samples + 32768).astype(np.uint16)
+        elif size == -8:
+            out = (samples >> 8).astype(np.int8)
+        elif size == 8:
+            out = ((samples >> 8) + 128).astype(np.uint8)
+        elif size == 32:
+            out = (samples / 32768.0).astype(np.float32)
+        elif size == -32:
+            out = samples << 16
+        else:
+            raise ValueError(f'unsupported mixer format {size}')
+        return np.repeat(out, channels).tobytes()
+
+    samples = array('h')
+    samples.frombytes(pcm)
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    if size == -16:
+        out = samples
+    elif size == 16:
+        out = array('H', [v + 32768 for v in samples])
+    elif size == -8:
+        out = array('b', [v >> 8 for v in samples])
+    elif size == 8:
+        out = array('B', [(v >> 8) + 128 for v in samples])
+    elif size == 32:
+        out = array('f', [v / 32768.0 for v in samples])
+    elif size == -32:
+        out = array('i', [v << 16 for v in samples])
+    else:
+        raise ValueError(f'unsupported mixer format {size}')
+    if channels > 1:
+        out = array(out.typecode, [v for v in out for _ in range(channels)])
+    return out.tobytes()
+
+
+def _builtin_chords(duration_ms=120, volume=0.5):
+    """{name: (freqs, duration_ms, volume)} of the built-in SFX."""
+    c4 = 261.6256
+    e4 = 329.6276
+    g4 = 392.0
+    # success chord: C-major at C8 (4 octaves above C4 -> *16)
+    beep = ([c4 * 16.0, e4 * 16.0, g4 * 16.0], duration_ms, volume)
+    # collision chord: C-minor two octaves lower (C6, Eb6, G6)
+    low_beep = ([c4 * 4.0, e4 * 4.0 * (2 ** (-1/12)), g4 * 4.0],
+                max(160, duration_ms + 40), max(0.25, volume * 0.9))
+    return {'beep': beep, 'low_beep': low_beep}
+
+
+def make_chord_sound(freqs, duration_ms=120, volume=0.5, cache=None):
+    """Synthesize a chord straight into a pygame.mixer.Sound in the mixer's
+    own sample rate and format. Returns None when the mixer is not
+    available.
+
+    With a `cache` (an sfx_cache.SfxCache) the finished buffer is looked up
+    by its parameters, the generator version and the mixer format before
+    synthesizing, and stored after."""
+    _ensure_mixer()
+    mixer_format = pygame.mixer.get_init()
+    if not mixer_format:
+        return None
+    frequency, size, channels = mixer_format
+    freqs = list(freqs)
+    buffer = None
+    if cache is not None:
+        entry_key = cache_key(kind='chord', freqs=freqs, duration_ms=duration_ms, volume=volume,
+                              envelope=_CHORD_ENVELOPE, version=SFX_GENERATOR_VERSION,
+                              mixer=list(mixer_format))
+        buffer = cache.get(entry_key)
+    if buffer is None:
+        pcm = _synthesize(freqs, duration_ms, volume, frequency, _CHORD_ENVELOPE)
+        buffer = _pcm_for_mixer(pcm, size, channels)
+        if cache is not None:
+            cache.put(entry_key, buffer)
+    return pygame.mixer.Sound(buffer=buffer)
+
+
+def init_sounds(load_beep=True, freq_hz=880, duration_ms=120, volume=0.5, sample_rate=44100,
+                cache=sfx_cache):
     """Initialize mixer and load builtin SFX (only 'beep' by default).
-    Returns True if mixer and at least one SFX is available."""
+    Returns True if mixer and at least one SFX is available.
+
+    The built-in SFX are synthesized in memory at the mixer's own rate, so
+    `sample_rate` only matters to export_sfx(). Buffers are reused from
+    `cache` when present (pass None to always synthesize)."""
     global _SFX_INITIALIZED
     if _SFX_INITIALIZED:
         return bool(_SFX)
     _SFX_INITIALIZED = True
 
     _ensure_mixer()
-    _ensure_asset_dirs()
     if load_beep:
-        try:
-            # default high-pitched beep
-            # Create a high C-major chord for success (C8,E8,G8)
-            c4 = 261.6256
-            e4 = 329.6276
-            g4 = 392.0
-            # target success chord at C8 (4 octaves above C4 -> *16)
-            c8 = c4 * 16.0
-            e8 = e4 * 16.0
-            g8 = g4 * 16.0
-            if not os.path.exists(_BEEP_PATH):
-                chord_args = {
-                    'freqs': [c8, e8, g8],
-                    'duration_ms': duration_ms,
-                    'volume': volume,
-                    'sample_rate': sample_rate,
-                }
-                _create_chord_wav(_BEEP_PATH, **chord_args)
-            snd = pygame.mixer.Sound(_BEEP_PATH)
-            _SFX['beep'] = snd
-            # also create a low-frequency C-minor chord for collisions ~2 octaves lower
-            low_path = os.path.join(SFX_DIR, 'sfx_low_beep.wav')
-            if not os.path.exists(low_path):
-                # use C6 (two octaves above C4 -> *4) for the low beep (C6, Eb6, G6)
-                c6 = c4 * 4.0
-                # Eb6 is E-flat at the 6th octave
-                eb6 = e4 * 4.0 * (2 ** (-1/12))
-                g6 = g4 * 4.0
-                low_args = {
-                    'freqs': [c6, eb6, g6],
-                    'duration_ms': max(160, duration_ms + 40),
-                    'volume': max(0.25, volume * 0.9),
-                    'sample_rate': sample_rate,
-                }
-                _create_chord_wav(low_path, **low_args)
+        for name, (freqs, chord_ms, chord_volume) in _builtin_chords(duration_ms, volume).items():
             try:
-                _SFX['low_beep'] = pygame.mixer.Sound(low_path)
+                snd = make_chord_sound(freqs, chord_ms, chord_volume, cache=cache)
             except Exception:
-                _SFX.pop('low_beep', None)
-        except Exception:
-            # keep going; callers will see missing entry
-            _SFX.pop('beep', None)
+                # keep going; callers will see missing entry
+                snd = None
+            if snd is not None:
+                _SFX[name] = snd
+        if cache is not None:
+            # save the index if a lookup dropped a stale entry
+            cache.flush()
 
     return bool(_SFX)
 
 
+def export_sfx(directory=SFX_DIR, duration_ms=120, volume=0.5, sample_rate=44100):
+    """Write the built-in SFX as sfx_<name>.wav files into `directory`
+    (created if needed) and return their paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, (freqs, chord_ms, chord_volume) in _builtin_chords(duration_ms, volume).items():
+        path = os.path.join(directory, f'sfx_{name}.wav')
+        _create_chord_wav(path, freqs, chord_ms, chord_volume, sample_rate)
+        paths.append(path)
+    return paths
+
+
 def get_sfx(name):
     """Return the pygame.mixer.Sound for `name` or None if not available."""
     return _SFX.get(name)
 
 
-def play_sfx(name, volume=None):
-    """Play a short sound effect by name. If `volume` is provided (0.0-1.0)
-    it will be applied for this play call only."""
+def play_sfx(name, volume=None, priority=None):
+    """Play a short sound effect by name on its category's channels (see
+    SFX_CATEGORIES). If `volume` is provided (0.0-1.0) it scales the SFX
+    volume for this play call only; `priority` overrides the category's
+    when channels run out. Returns False if nothing was played."""
     snd = get_sfx(name)
     if snd is None:
         # try to lazily initialize builtins
@@ -206,19 +293,22 @@ def play_sfx(name, volume=None):
         if snd is None:
             return False
 
+    if _POOL is None:
+        return False
     try:
-        if volume is not None:
-            prev = snd.get_volume()
-            snd.set_volume(float(max(0.0, min(1.0, volume))))
-            snd.play()
-            snd.set_volume(prev)
-        else:
-            snd.play()
-        return True
+        volume = 1.0 if volume is None else float(max(0.0, min(1.0, volume)))
+        return _POOL.play(snd, SFX_CATEGORY.get(name, 'misc'), volume, priority) is not None
     except Exception:
         return False
 
 
+def sfx_stats():
+    """Counts of SFX voices played, stolen and dropped so far."""
+    if _POOL is None:
+        return {'played': 0, 'stolen': 0, 'dropped': 0}
+    return _POOL.stats()
+
+
 def register_sfx(name, path):
     """Load and register a SFX from a file path under the given name."""
     _ensure_mixer()
@@ -259,12 +349,10 @@ def set_bgm_volume(vol):
 
 
 def set_sfx_volume(vol):
+    global _SFX_VOLUME
     try:
-        v = max(0.0, min(1.0, float(vol)))
-        for snd in _SFX.values():
-            try:
-                snd.set_volume(v)
-            except Exception:
-                pass
+        _SFX_VOLUME = max(0.0, min(1.0, float(vol)))
+        if _POOL is not None:
+            _POOL.set_volume(_SFX_VOLUME)
     except Exception:
         pass
@@ -0,0 +1,64 @@
+"""BatchSimulation must follow the same rules as the scalar Simulation."""
+import random
+import pytest
+from engine import Simulation, EAT, WALL, SELF
+from tournament import greedy_policy
+
+np = pytest.importorskip('numpy')
+import batch_engine  # noqa: E402  (needs NumPy)
+
+EVENT_CODES = {(): batch_engine.NONE, (EAT,): batch_engine.EAT,
+               (WALL,): batch_engine.WALL, (SELF,): batch_engine.SELF}
+ACTION_CODES = {direction: code for code, direction in enumerate(batch_engine.ACTIONS)}
+
+
+def batch_body(batch, i):
+    """Cells of board `i`, head first."""
+    positions = (batch.start[i] + np.arange(batch.length[i])) % batch.capacity
+    return batch.body[i, positions].tolist()
+
+
+def run_lockstep(seeds, policy, cols=12, rows=10, max_ticks=3000):
+    """Step one Simulation per seed and a BatchSimulation of the same boards
+    with the same actions, checking they agree after every tick. Food
+    placement uses different RNGs, so the batch copies each board's food
+    cell from its scalar twin. Returns the death event of each game (None
+    if it was still running)."""
+    sims = [Simulation(cols, rows, rng=random.Random(seed), clock=lambda: 0) for seed in seeds]
+    batch = batch_engine.BatchSimulation(len(seeds), cols, rows, seed=0)
+    deaths = [None] * len(sims)
+    for i, sim in enumerate(sims):
+        batch.food[i] = sim.food_cell
+    for _ in range(max_ticks):
+        if all(sim.over for sim in sims):
+            break
+        actions = [policy(sim, i) for i, sim in enumerate(sims)]
+        codes = batch.step([batch_engine.KEEP if a is None else ACTION_CODES[a] for a in actions])
+        for i, sim in enumerate(sims):
+            if sim.over:
+                assert codes[i] == batch_engine.NONE
+                continue
+            events = sim.step(actions[i])
+            assert codes[i] == EVENT_CODES[events]
+            if sim.over:
+                deaths[i] = events[0]
+            assert batch.over[i] == sim.over
+            assert batch.score[i] == sim.score
+            assert batch.ticks[i] == sim.ticks
+            assert batch_body(batch, i) == list(sim.body)
+            assert batch.occ[i].tobytes() == bytes(sim.occupancy)
+            batch.food[i] = -1 if sim.food_cell is None else sim.food_cell
+    return deaths
+
+
+def test_random_actions_match_scalar_engine():
+    rng = random.Random(1)
+    choices = [None] + list(batch_engine.ACTIONS)
+    deaths = run_lockstep(range(40), lambda sim, i: rng.choice(choices))
+    assert None not in deaths
+
+
+def test_greedy_games_match_scalar_engine():
+    deaths = run_lockstep(range(100, 120), lambda sim, i: greedy_policy(sim))
+    # greedy snakes grow long enough to die both ways
+    assert set(deaths) == {WALL, SELF}
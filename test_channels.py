@@ -0,0 +1,76 @@
+"""Voice limiting and stealing in channels.ChannelPool."""
+import os
+import pytest
+
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+import pygame  # noqa: E402
+from channels import ChannelPool, Category  # noqa: E402
+
+
+@pytest.fixture
+def sound():
+    try:
+        pygame.mixer.init()
+    except pygame.error:
+        pytest.skip('no audio device')
+    frequency, size, channels = pygame.mixer.get_init()
+    # a few seconds of silence keeps every voice busy for the whole test
+    silence = bytes(frequency * 5 * channels * abs(size) // 8)
+    yield pygame.mixer.Sound(buffer=silence)
+    pygame.mixer.quit()
+
+
+def test_category_channels_are_reserved_and_used_in_turn(sound):
+    pool = ChannelPool({'pickup': Category(channels=2, priority=1)})
+    first = pool.play(sound, 'pickup')
+    second = pool.play(sound, 'pickup')
+    assert first is not None and second is not None and first != second
+    assert first.get_busy() and second.get_busy()
+    assert pool.stats() == {'played': 2, 'stolen': 0, 'dropped': 0}
+
+
+def test_full_category_steals_its_oldest_voice(sound):
+    pool = ChannelPool({'pickup': Category(channels=2, priority=1)})
+    oldest = pool.play(sound, 'pickup')
+    newer = pool.play(sound, 'pickup')
+    assert pool.play(sound, 'pickup') == oldest
+    # the voice on `newer` is now the oldest
+    assert pool.play(sound, 'pickup') == newer
+    assert pool.stats() == {'played': 4, 'stolen': 2, 'dropped': 0}
+
+
+def test_voice_limit_steals_lowest_priority_then_oldest(sound):
+    pool = ChannelPool({'low': Category(channels=2, priority=0),
+                        'high': Category(channels=2, priority=2)}, max_voices=2)
+    low_old = pool.play(sound, 'low')
+    pool.play(sound, 'low')
+    # at the limit: the high-priority voice takes the oldest low one
+    high = pool.play(sound, 'high')
+    assert high is not None
+    assert not low_old.get_busy()
+    assert sum(channel.get_busy() for channel in pool._voices) == 2
+    assert pool.stats() == {'played': 3, 'stolen': 1, 'dropped': 0}
+
+
+def test_lower_priority_voice_is_dropped(sound):
+    pool = ChannelPool({'low': Category(channels=1, priority=0),
+                        'high': Category(channels=1, priority=2)}, max_voices=1)
+    high = pool.play(sound, 'high')
+    assert pool.play(sound, 'low') is None
+    assert high.get_busy()
+    # a per-play priority can override the category's
+    assert pool.play(sound, 'low', priority=2) is not None
+    assert not high.get_busy()
+    assert pool.stats() == {'played': 2, 'stolen': 1, 'dropped': 1}
+
+
+def test_volume_is_set_per_channel(sound):
+    pool = ChannelPool({'pickup': Category(channels=2, priority=1)})
+    pool.set_volume(0.5)
+    quiet = pool.play(sound, 'pickup', volume=0.5)
+    loud = pool.play(sound, 'pickup', volume=1.0)
+    assert quiet.get_volume() == pytest.approx(0.25, abs=0.01)
+    assert loud.get_volume() == pytest.approx(0.5, abs=0.01)
+    assert sound.get_volume() == pytest.approx(1.0)
+    pool.set_volume(1.0)
+    assert quiet.get_volume() == pytest.approx(0.5, abs=0.01)
@@ -0,0 +1,153 @@
+"""Tests for the recording format, seeking and exact replay (replay.py)."""
+import random
+import pytest
+from constants import DIRECTIONS
+from engine import Simulation, SELF
+from replay import (
+    Recorder,
+    Recording,
+    ReplayError,
+    decode_state,
+    encode_state,
+    read_varint,
+    write_varint,
+)
+from tournament import greedy_policy
+
+UP, DOWN, LEFT, RIGHT = (DIRECTIONS[name] for name in ('UP', 'DOWN', 'LEFT', 'RIGHT'))
+
+
+def record(seed, presses, max_ticks=2000, keyframe_interval=50, recorded=True):
+    """Play a game where `presses` maps a tick to the key presses (in order)
+    before it and greedy_policy steers otherwise; return (sim, bytes), with
+    no bytes unless `recorded`."""
+    sim = Simulation(seed=seed, clock=lambda: 0)
+    recorder = Recorder(sim, keyframe_interval=keyframe_interval) if recorded else None
+    while not sim.over and sim.ticks < max_ticks:
+        keys = presses.get(sim.ticks)
+        if keys is None:
+            direction = greedy_policy(sim)
+            if direction is not None:
+                sim.change_direction(direction)
+        else:
+            for direction in keys:
+                sim.change_direction(direction)
+        sim.step()
+    return sim, recorder.finish() if recorded else None
+
+
+def test_varint_round_trip():
+    out = bytearray()
+    values = [0, 1, 127, 128, 300, 2 ** 32, 2 ** 64 - 1]
+    for value in values:
+        write_varint(out, value)
+    pos = 0
+    for value in values:
+        decoded, pos = read_varint(out, pos)
+        assert decoded == value
+    assert pos == len(out)
+
+
+def test_varint_rejects_negative_and_truncated():
+    with pytest.raises(ValueError):
+        write_varint(bytearray(), -1)
+    with pytest.raises(ReplayError):
+        read_varint(b'\x80\x80', 0)
+
+
+def test_state_round_trip():
+    sim, _ = record(seed=3, presses={}, max_ticks=300, keyframe_interval=0)
+    state = sim.get_state()
+    assert decode_state(encode_state(state, sim.cols), sim.cols) == state
+
+
+def test_two_turns_in_one_tick_do_not_reverse():
+    # moving RIGHT, UP then LEFT before one tick: LEFT would reverse the
+    # last move, so only UP takes effect
+    sim = Simulation(seed=1, clock=lambda: 0)
+    sim.step()
+    sim.change_direction(UP)
+    sim.change_direction(LEFT)
+    assert sim.step() != (SELF,)
+    assert not sim.over
+    assert sim.snake.direction == UP
+
+
+def test_two_turns_in_one_tick_round_trip():
+    presses = {2: [UP, LEFT], 5: [LEFT, DOWN], 9: [DOWN, RIGHT, UP]}
+    live, data = record(seed=11, presses=presses)
+    replayed = Recording.from_bytes(data).play()
+    assert replayed.get_state() == live.get_state()
+    assert (replayed.ticks, replayed.score, replayed.over) == (live.ticks, live.score, live.over)
+
+
+@pytest.mark.parametrize('seed', [3, 8])
+def test_recording_does_not_change_the_game(seed):
+    presses = {2: [UP, LEFT], 9: [DOWN]}
+    recorded, _ = record(seed=seed, presses=presses, keyframe_interval=7)
+    unrecorded, _ = record(seed=seed, presses=presses, recorded=False)
+    assert recorded.ticks > 7
+    assert recorded.get_state() == unrecorded.get_state()
+
+
+@pytest.mark.parametrize('seed', [1, 2, 7, 42])
+def test_play_matches_live_game(seed):
+    live, data = record(seed=seed, presses={})
+    assert live.over
+    recording = Recording.from_bytes(data)
+    assert recording.total_ticks == live.ticks
+    assert recording.play().get_state() == live.get_state()
+
+
+def test_seek_matches_straight_playback():
+    _, data = record(seed=5, presses={}, keyframe_interval=40)
+    recording = Recording.from_bytes(data)
+    assert recording.keyframes
+    targets = sorted({0, 1, 39, 40, 41, 120, recording.total_ticks // 2, recording.total_ticks,
+                      *random.Random(0).sample(range(recording.total_ticks), 10)})
+    states = {}
+
+    def on_step(sim, events):
+        if sim.ticks in targets:
+            grid = sim.snake.grid
+            states[sim.ticks] = sim.get_state() + (grid.free[:grid.free_count],)
+
+    on_step(recording.new_simulation(clock=lambda: 0), ())
+    recording.play(on_step=on_step)
+    for tick in targets:
+        sim = recording.seek(tick, clock=lambda: 0)
+        # keyframes carry the free-cell order, so later food matches too
+        state = sim.get_state() + (sim.snake.grid.free[:sim.snake.grid.free_count],)
+        # a keyframe at `tick` already carries the turn made before the
+        # next tick, so only the pending direction may differ
+        assert state[:3] + state[4:] == states[tick][:3] + states[tick][4:]
+
+
+def test_play_from_any_tick_matches():
+    live, data = record(seed=9, presses={}, keyframe_interval=25)
+    recording = Recording.from_bytes(data)
+    for start in (1, 25, 50, 51, recording.total_ticks // 3):
+        assert recording.play(start=start).get_state() == live.get_state()
+
+
+def test_rejects_corrupt_data():
+    _, data = record(seed=4, presses={}, max_ticks=200)
+    with pytest.raises(ReplayError):
+        Recording.from_bytes(b'XXXX' + data[4:])
+    with pytest.raises(ReplayError):
+        Recording.from_bytes(data[:4] + bytes([99]) + data[5:])
+    with pytest.raises(ReplayError):
+        # end marker missing
+        Recording.from_bytes(data[:-2])
+    with pytest.raises(ReplayError):
+        Recording.from_bytes(data[:len(data) // 2])
+
+
+def test_rejects_bad_direction_code():
+    sim = Simulation(seed=1, clock=lambda: 0)
+    data = bytearray(Recorder(sim, keyframe_interval=0).finish())
+    # replace the END entry with a turn using an undefined code
+    data[-1] = 0x7F
+    data += b'\x00\xff'
+    with pytest.raises(ReplayError):
+        Recording.from_bytes(bytes(data))
@@ -0,0 +1,58 @@
+"""The on-disk SFX cache (sfx_cache.py) must never cost a sound."""
+import json
+import os
+from sfx_cache import SfxCache, INDEX_NAME, key
+
+
+def index_path(cache):
+    return os.path.join(cache.directory, INDEX_NAME)
+
+
+def test_put_then_get(tmp_path):
+    entry_key = key(kind='test', n=1)
+    assert SfxCache(str(tmp_path)).put(entry_key, b'abcd')
+    cache = SfxCache(str(tmp_path))
+    assert cache.get(entry_key) == b'abcd'
+    assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_bad_index_entries_miss(tmp_path):
+    good, no_size, not_dict = key(n=1), key(n=2), key(n=3)
+    for entry_key in (good, no_size, not_dict):
+        (tmp_path / (entry_key + '.pcm')).write_bytes(b'abcd')
+    index = {good: {'size': 4, 'used': 1.0}, no_size: {'used': 1.0}, not_dict: 4,
+             '../escape': {'size': 4, 'used': 1.0}}
+    (tmp_path / INDEX_NAME).write_text(json.dumps(index))
+    cache = SfxCache(str(tmp_path))
+    assert cache.get(good) == b'abcd'
+    assert cache.get(no_size) is None
+    assert cache.get(not_dict) is None
+    # the cleaned index is saved and stays usable
+    assert cache.flush()
+    with open(index_path(cache)) as f:
+        assert list(json.load(f)) == [good]
+    assert cache.put(no_size, b'efgh')
+    assert SfxCache(str(tmp_path)).get(no_size) == b'efgh'
+
+
+def test_all_hits_do_not_rewrite_index(tmp_path):
+    entry_key = key(n=1)
+    assert SfxCache(str(tmp_path)).put(entry_key, b'abcd')
+    before = os.stat(index_path(SfxCache(str(tmp_path)))).st_ino
+    cache = SfxCache(str(tmp_path))
+    assert cache.get(entry_key) == b'abcd'
+    assert cache.flush()
+    # os.replace() would have put a new file in place
+    assert os.stat(index_path(cache)).st_ino == before
+
+
+def test_over_budget_evicts_least_recently_used(tmp_path):
+    cache = SfxCache(str(tmp_path), max_bytes=8)
+    old, new, newest = key(n=1), key(n=2), key(n=3)
+    cache.put(old, b'aaaa')
+    cache.put(new, b'bbbb')
+    cache.get(old)
+    cache.put(newest, b'cccc')
+    assert cache.get(new) is None
+    assert cache.get(old) == b'aaaa'
+    assert cache.get(newest) == b'cccc'
@@ -0,0 +1,155 @@
+"""Run a Simulation on its own thread and hand the renderer snapshots.
+
+In the default single-threaded loop a slow draw or a vsync-blocked flip
+delays input handling and the next simulation tick. SimulationThread
+instead steps the game on a fixed `tick_ms` schedule of its own and, after
+every tick, publishes an immutable Snapshot of the board. The render loop
+reads whichever snapshot is newest without taking a lock: a snapshot is
+never modified once built, and publishing one is a single reference
+assignment, so the reader always sees a complete tick (the immutable
+equivalent of swapping front and back buffers).
+
+Input goes the other way through a queue drained before each tick, and the
+events of each tick (EAT, WALL, SELF) come back through another, so the
+Simulation itself is only ever touched by its thread.
+"""
+import threading
+import time
+from collections import deque, namedtuple
+from constants import MAX_CATCH_UP_MS
+from engine import NO_EVENTS
+
+
+class Snapshot(namedtuple('Snapshot', 'cols rows ticks score over head body food_cell occupancy changed')):
+    """The state of a game after one tick, duck-typed like a Simulation for
+    the renderers. `body` is a tuple (head first), `occupancy` bytes and
+    `changed` the cells that changed since the previous snapshot (None when
+    the whole board did)."""
+
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, sim):
+        """Snapshot `sim`, taking over its change tracking."""
+        changes = sim.changes
+        sim.changes = []
+        return cls(sim.cols, sim.rows, sim.ticks, sim.score, sim.over, sim.head,
+                   tuple(sim.body), sim.food_cell, bytes(sim.occupancy),
+                   tuple(changes) if changes is not None else None)
+
+    def is_free(self, cell):
+        return not self.occupancy[cell]
+
+
+class SimulationThread:
+    """Steps `sim` every `sim.tick_ms` on a daemon thread until the game
+    ends or stop() is called.
+
+    `before_tick(sim)`, if given, runs on the simulation thread before each
+    tick (Recording.steer, for replays). Ticks owed after a stall are caught
+    up to MAX_CATCH_UP_MS, like Simulation.update().
+    """
+
+    def __init__(self, sim, before_tick=None):
+        self.sim = sim
+        self.before_tick = before_tick
+        self._inputs = deque()
+        self._events = deque()
+        self._resumed = threading.Event()
+        self._resumed.set()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name='simulation', daemon=True)
+        # replaced (never modified) after every tick
+        self.snapshot = Snapshot.of(sim)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop stepping and wait for the thread to finish."""
+        self._stopping = True
+        self._resumed.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def pause(self):
+        self._resumed.clear()
+
+    def resume(self):
+        """Continue ticking from now, without catching up the paused time."""
+        self._resumed.set()
+
+    def change_direction(self, direction):
+        """Queue a direction change for the next tick."""
+        self._inputs.append(direction)
+
+    def drain_events(self):
+        """Return the events of every tick since the last call, combined."""
+        events = NO_EVENTS
+        while self._events:
+            events += self._events.popleft()
+        return events
+
+    def _tick(self):
+        sim = self.sim
+        while self._inputs:
+            sim.change_direction(self._inputs.popleft())
+        if self.before_tick is not None:
+            self.before_tick(sim)
+        events = sim.step()
+        if events:
+            self._events.append(events)
+        self.snapshot = Snapshot.of(sim)
+
+    def _run(self):
+        sim = self.sim
+        tick_s = sim.tick_ms / 1000.0
+        max_behind = max(1, MAX_CATCH_UP_MS // sim.tick_ms) * tick_s
+        next_tick = time.perf_counter() + tick_s
+        while not self._stopping and not sim.over:
+            if not self._resumed.is_set():
+                self._resumed.wait()
+                next_tick = time.perf_counter() + tick_s
+                continue
+            now = time.perf_counter()
+            if now < next_tick:
+                time.sleep(next_tick - now)
+                continue
+            if now - next_tick > max_behind:
+                next_tick = now
+            self._tick()
+            next_tick += tick_s
+
+
+class SnapshotView:
+    """What the render loop draws from while a SimulationThread runs.
+
+    Renderers keep per-game state keyed on the object they are handed and
+    consume its `changes` list (see DirtyRectRenderer), so they need one
+    long-lived mutable object rather than a new snapshot per tick. refresh()
+    points the view at the newest snapshot; everything else reads through
+    to it. `changes` collects the changed cells of each snapshot passed
+    along the way, or becomes None (redraw everything) if one was skipped.
+    """
+
+    def __init__(self, thread):
+        self.thread = thread
+        self.snapshot = None
+        self.changes = None
+
+    def refresh(self):
+        snapshot = self.thread.snapshot
+        previous = self.snapshot
+        if snapshot is previous:
+            return self
+        if (previous is None or snapshot.changed is None or self.changes is None
+                or snapshot.ticks != previous.ticks + 1):
+            self.changes = None
+        else:
+            self.changes.extend(snapshot.changed)
+        self.snapshot = snapshot
+        return self
+
+    def __getattr__(self, name):
+        return getattr(self.snapshot, name)
@@ -0,0 +1,193 @@
+"""Run many seeded headless games of automated players across all cores.
+
+A policy is any picklable (module-level) callable that receives the running
+`engine.Simulation` and returns a DIRECTIONS value, or None to keep going
+straight. Every policy plays the same seeds so their statistics compare
+fairly.
+
+    python tournament.py --games 500 --workers 8
+"""
+import argparse
+import os
+from collections import Counter, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from constants import DIRECTIONS, GRID_COLS, GRID_ROWS
+from engine import Simulation
+
+# Cause of death reported when a game hits `max_ticks` without ending
+TIMEOUT = 'timeout'
+
+GameResult = namedtuple('GameResult', 'policy seed score length ticks cause')
+
+
+def straight_policy(sim):
+    """Baseline: never turn."""
+    return None
+
+
+def greedy_policy(sim):
+    """Step towards the food along any direction that does not die on the
+    next tick; keep going straight when every move is fatal."""
+    snake = sim.snake
+    cols = sim.cols
+    row, col = divmod(snake.head, cols)
+    food = sim.food_cell
+    best = None
+    best_dist = None
+    for d in DIRECTIONS.values():
+        if d[0] == -snake.direction[0] and d[1] == -snake.direction[1]:
+            continue
+        c = col + d[0]
+        r = row + d[1]
+        if not (0 <= c < cols and 0 <= r < sim.rows):
+            continue
+        cell = r * cols + c
+        # the tail moves away this tick unless the snake is growing
+        if not sim.is_free(cell) and (cell != snake.tail or snake.grow_flag):
+            continue
+        if food is None:
+            dist = 0
+        else:
+            food_row, food_col = divmod(food, cols)
+            dist = abs(food_col - c) + abs(food_row - r)
+        if best_dist is None or dist < best_dist:
+            best, best_dist = d, dist
+    return best
+
+
+def hamiltonian_policy(sim):
+    """Follow a fixed Hamiltonian cycle (rows must be even): right along
+    row 0, snake back and forth over columns 1.. on the remaining rows, then
+    up column 0. Never dies before the board is full, so games run long."""
+    snake = sim.snake
+    row, col = divmod(snake.head, sim.cols)
+    if col == 0:
+        want = DIRECTIONS['RIGHT'] if row == 0 else DIRECTIONS['UP']
+    elif row % 2 == 0:
+        want = DIRECTIONS['DOWN'] if col == sim.cols - 1 else DIRECTIONS['RIGHT']
+    elif col == 1 and row != sim.rows - 1:
+        want = DIRECTIONS['DOWN']
+    else:
+        want = DIRECTIONS['LEFT']
+    if want[0] == -snake.direction[0] and want[1] == -snake.direction[1]:
+        # joining the cycle from the wrong side: drop onto the next row
+        want = DIRECTIONS['DOWN'] if row + 1 < sim.rows else DIRECTIONS['UP']
+    return want
+
+
+POLICIES = {
+    'straight': straight_policy,
+    'greedy': greedy_policy,
+    'hamiltonian': hamiltonian_policy,
+}
+
+
+def play_game(name, policy, seed, cols=GRID_COLS, rows=GRID_ROWS, max_ticks=100000):
+    """Play one seeded game to the end and return its GameResult."""
+    sim = Simulation(cols, rows, seed=seed, clock=lambda: 0)
+    cause = TIMEOUT
+    while sim.ticks < max_ticks:
+        events = sim.step(policy(sim))
+        if sim.over:
+            cause = events[0]
+            break
+    return GameResult(name, seed, sim.score, len(sim.body), sim.ticks, cause)
+
+
+def _play_chunk(name, policy, seeds, cols, rows, max_ticks):
+    # one task per chunk of seeds keeps inter-process traffic low
+    return [play_game(name, policy, seed, cols, rows, max_ticks) for seed in seeds]
+
+
+def run_tournament(policies=None, games=100, seed=0, workers=None,
+                   cols=GRID_COLS, rows=GRID_ROWS, max_ticks=100000, chunk_size=8):
+    """Yield a GameResult for every (policy, seed) game as soon as its chunk
+    finishes. `policies` maps names to policy callables (POLICIES by
+    default); games use seeds ``seed .. seed + games - 1``."""
+    policies = POLICIES if policies is None else policies
+    seeds = list(range(seed, seed + games))
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [
+            pool.submit(_play_chunk, name, policy, seeds[i:i + chunk_size], cols, rows, max_ticks)
+            for name, policy in policies.items()
+            for i in range(0, len(seeds), chunk_size)
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+class PolicyStats:
+    """Running statistics for one policy, updated one result at a time."""
+
+    def __init__(self, name):
+        self.name = name
+        self.games = 0
+        self.total_score = 0
+        self.best_score = 0
+        self.total_length = 0
+        self.total_ticks = 0
+        self.causes = Counter()
+
+    def add(self, result):
+        self.games += 1
+        self.total_score += result.score
+        self.best_score = max(self.best_score, result.score)
+        self.total_length += result.length
+        self.total_ticks += result.ticks
+        self.causes[result.cause] += 1
+
+    @property
+    def mean_score(self):
+        return self.total_score / self.games if self.games else 0.0
+
+    @property
+    def mean_length(self):
+        return self.total_length / self.games if self.games else 0.0
+
+    @property
+    def mean_ticks(self):
+        return self.total_ticks / self.games if self.games else 0.0
+
+    def __str__(self):
+        causes = ', '.join(f"{cause}={count}" for cause, count in sorted(self.causes.items()))
+        return (f"{self.name}: games={self.games} mean_score={self.mean_score:.2f} "
+                f"best={self.best_score} mean_length={self.mean_length:.1f} "
+                f"mean_ticks={self.mean_ticks:.0f} [{causes}]")
+
+
+def aggregate(results, stats=None):
+    """Fold GameResults into a dict of PolicyStats keyed by policy name."""
+    stats = {} if stats is None else stats
+    for result in results:
+        if result.policy not in stats:
+            stats[result.policy] = PolicyStats(result.policy)
+        stats[result.policy].add(result)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=100, help='games per policy')
+    parser.add_argument('--seed', type=int, default=0, help='first seed')
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: all cores)')
+    parser.add_argument('--cols', type=int, default=GRID_COLS)
+    parser.add_argument('--rows', type=int, default=GRID_ROWS)
+    parser.add_argument('--max-ticks', type=int, default=100000)
+    parser.add_argument('--policy', action='append', choices=sorted(POLICIES),
+                        help='policy to play (repeatable; default: all)')
+    args = parser.parse_args(argv)
+
+    policies = {name: POLICIES[name] for name in (args.policy or POLICIES)}
+    stats = {}
+    total = len(policies) * args.games
+    for done, result in enumerate(run_tournament(policies, args.games, args.seed, args.workers,
+                                                 args.cols, args.rows, args.max_ticks), 1):
+        aggregate([result], stats)
+        print(f"[tournament] {done}/{total} {result.policy} seed={result.seed} "
+              f"score={result.score} ticks={result.ticks} cause={result.cause}")
+    for policy_stats in stats.values():
+        print(f"[tournament] {policy_stats}")
+
+
+if __name__ == "__main__":
+    main()
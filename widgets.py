@@ -0,0 +1,207 @@
+"""Retained-mode widgets for the menu screens.
+
+A Page is laid out once: every widget renders its text through the shared
+text cache and keeps its own hit rect, so event handling never renders
+anything. The page repaints (and has it shown) only after something
+visible changed -- the selection, a value, a label -- or the display
+surface was replaced, so an idle menu does no drawing at all.
+"""
+import pygame
+from constants import (
+    ACTIVE_THEME,
+    SCREEN_WIDTH,
+    MENU_TITLE_FONT_SIZE,
+    MENU_OPTION_FONT_SIZE,
+)
+from fonts import get_font, text_cache
+
+HIGHLIGHT_COLOR = (255, 255, 0)
+
+
+class Widget:
+    """Base class: something drawn at a fixed row of a Page."""
+
+    def __init__(self, y):
+        self.y = y
+        self.page = None
+        self.visible = True
+
+    def changed(self):
+        """Mark the owning page for repaint."""
+        if self.page is not None:
+            self.page.dirty = True
+
+    def show(self, visible=True):
+        if visible != self.visible:
+            self.visible = visible
+            self.changed()
+
+    def hit(self, pos):
+        return False
+
+    def draw(self, screen, selected):
+        pass
+
+
+class Label(Widget):
+    """Horizontally centered text with a settable string."""
+
+    def __init__(self, text, y, size=MENU_OPTION_FONT_SIZE, color=None):
+        super().__init__(y)
+        self.font = get_font(size)
+        self.color = color or ACTIVE_THEME["text_color"]
+        self._text = None
+        self.text = text
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        if text == self._text:
+            return
+        self._text = text
+        self._layout()
+        self.changed()
+
+    def _layout(self):
+        self.surface = text_cache.render(self.font, self._text, self.color)
+        self.pos = (SCREEN_WIDTH // 2 - self.surface.get_width() // 2, self.y)
+
+    def draw(self, screen, selected):
+        screen.blit(self.surface, self.pos)
+
+
+class Title(Label):
+    def __init__(self, text, y=100):
+        super().__init__(text, y, size=MENU_TITLE_FONT_SIZE)
+
+
+class Button(Label):
+    """A selectable label; drawn in HIGHLIGHT_COLOR while selected. Its hit
+    rect is the text padded by a few pixels."""
+
+    def _layout(self):
+        super()._layout()
+        self.highlight = text_cache.render(self.font, self._text, HIGHLIGHT_COLOR)
+        x, y = self.pos
+        self.rect = pygame.Rect(x - 6, y - 4, self.surface.get_width() + 12, self.surface.get_height() + 6)
+
+    def hit(self, pos):
+        return self.rect.collidepoint(pos)
+
+    def draw(self, screen, selected):
+        screen.blit(self.highlight if selected else self.surface, self.pos)
+
+
+class KeyBindRow(Button):
+    """Button showing "N. Control: key" for one entry of a key-binding dict."""
+
+    def __init__(self, number, control, keys, y):
+        self.number = number
+        self.control = control
+        self.keys = keys
+        super().__init__(self._describe(), y)
+
+    def _describe(self):
+        keyval = self.keys.get(self.control, None)
+        value = pygame.key.name(keyval) if keyval is not None else "None"
+        return f"{self.number}. {self.control.capitalize()}: {value}"
+
+    def refresh(self):
+        """Re-read the binding (after a rebind)."""
+        self.text = self._describe()
+
+
+class Slider(Widget):
+    """A 0..1 value shown as a label above a bar with a draggable knob."""
+
+    def __init__(self, label, value, y, width=320, height=8):
+        super().__init__(y)
+        self.label_text = label
+        self.width = width
+        self.height = height
+        self.x = SCREEN_WIDTH // 2 - width // 2
+        self.bar_rect = pygame.Rect(self.x, y, width, height)
+        self.label = Label("", y - 30)
+        self.label_highlight = None
+        self._value = None
+        self.value = value
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        value = max(0.0, min(1.0, value))
+        if value == self._value:
+            return
+        self._value = value
+        self.label.text = f"{self.label_text}: {int(value * 100)}%"
+        self.label_highlight = text_cache.render(self.label.font, self.label.text, HIGHLIGHT_COLOR)
+        self.fill_rect = pygame.Rect(self.x, self.y, int(value * self.width), self.height)
+        self.knob_rect = pygame.Rect(self.x + int(value * self.width) - 8, self.y - 6, 16, 20)
+        self.changed()
+
+    def value_at(self, x):
+        """The value a click or drag at screen column `x` selects."""
+        return max(0, min(1, (x - self.x) / self.width))
+
+    def hit(self, pos):
+        return self.bar_rect.collidepoint(pos) or self.knob_rect.collidepoint(pos)
+
+    def draw(self, screen, selected):
+        screen.blit(self.label_highlight if selected else self.label.surface, self.label.pos)
+        pygame.draw.rect(screen, (100, 100, 100), self.bar_rect)
+        pygame.draw.rect(screen, (50, 200, 50), self.fill_rect)
+        pygame.draw.rect(screen, HIGHLIGHT_COLOR if selected else (220, 220, 220), self.knob_rect)
+
+
+class Page:
+    """One menu screen: a title, the selectable `items` (navigated with
+    move()/select()) and optional non-selectable `extras`."""
+
+    def __init__(self, title, items, extras=()):
+        self.items = list(items)
+        self.widgets = [title] + self.items + list(extras)
+        for widget in self.widgets:
+            widget.page = self
+        self.selected = 0
+        self.dirty = True
+        self._screen = None
+
+    def invalidate(self):
+        """Repaint on the next present(), e.g. after a sub-menu drew over it."""
+        self.dirty = True
+
+    def select(self, index):
+        if index != self.selected:
+            self.selected = index
+            self.dirty = True
+
+    def move(self, step):
+        self.select((self.selected + step) % len(self.items))
+
+    def item_at(self, pos):
+        """Index of the item under `pos`, or None."""
+        for i, item in enumerate(self.items):
+            if item.hit(pos):
+                return i
+        return None
+
+    def present(self, screen, show=pygame.display.flip):
+        """Repaint `screen` and call `show()` to put it on the display if
+        anything changed; return True if it did."""
+        if not self.dirty and screen is self._screen:
+            return False
+        self._screen = screen
+        self.dirty = False
+        screen.fill(ACTIVE_THEME["background_color"])
+        selected = self.items[self.selected] if self.items else None
+        for widget in self.widgets:
+            if widget.visible:
+                widget.draw(screen, widget is selected)
+        show()
+        return True